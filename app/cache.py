@@ -0,0 +1,69 @@
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Small thread-safe in-process cache with per-entry expiry.
+
+    Entries live for `ttl_seconds` and are kept per Lambda container, so they
+    only save DB round trips between requests served by the same container.
+    When `max_entries` is set, the oldest entry is evicted on overflow.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic() + ttl, value)
+            if self.max_entries and len(self._entries) > self.max_entries:
+                oldest_key = next(iter(self._entries))
+                del self._entries[oldest_key]
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing and storing it on a miss.
+
+        Falsy results (None, empty lists) are not cached so that a failed DB
+        lookup is retried on the next call.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        value = factory()
+        if value:
+            self.set(key, value)
+        return value
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return entry[1] if entry else default
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def keys(self) -> list:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                k for k, (expires_at, _) in self._entries.items() if expires_at >= now
+            ]
@@ -0,0 +1,157 @@
+"""
+Command line entry points for build-time and maintenance tasks.
+
+Run from the `app/` directory with the same environment variables as the API:
+
+    python cli.py export-school-snapshot
+    python cli.py compile-forms --form-id <form_id> [--auth-group <auth_group>]
+    python cli.py import-students --file students.csv --auth-group <auth_group>
+    python cli.py export-students --output students.csv --format csv [--filter grade=11]
+"""
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+from helpers import SUPPORTED_LOCALES, validate_and_build_query_params
+from logger_config import setup_logger
+from mapping import ENROLLMENT_RECORD_PARAMS, STUDENT_QUERY_PARAMS, USER_QUERY_PARAMS
+from services.compiled_form_service import COMPILED_FORMS_DIR, compile_forms
+from services.student_import_service import (
+    IMPORT_FORMATS,
+    import_students,
+    parse_import_rows,
+)
+from services.school_snapshot_service import (
+    SCHOOL_SNAPSHOT_PATH,
+    export_school_snapshot,
+)
+from services.student_service import (
+    EXPORT_FORMATS,
+    iter_student_export,
+    parse_student_fields,
+)
+
+logger = setup_logger()
+
+
+def export_school_snapshot_command(args):
+    meta = export_school_snapshot(Path(args.output))
+    logger.info(f"School snapshot version {meta['version']} written to {args.output}")
+
+
+def compile_forms_command(args):
+    results = compile_forms(
+        args.form_id,
+        args.auth_group,
+        locale=args.locale,
+        lazy=args.lazy,
+        output_dir=Path(args.output),
+    )
+    failed = [result for result in results if "error" in result]
+    logger.info(
+        f"Compiled {len(results) - len(failed)} form artifacts into {args.output}"
+    )
+    if failed:
+        raise SystemExit(f"{len(failed)} form artifacts failed to compile")
+
+
+def import_students_command(args):
+    import_format = args.format or Path(args.file).suffix.lstrip(".").lower()
+    rows = parse_import_rows(Path(args.file).read_bytes(), import_format)
+
+    async def run_import():
+        async for result in import_students(
+            rows, args.auth_group, args.id_generation, args.dry_run
+        ):
+            print(json.dumps(result), flush=True)
+
+    asyncio.run(run_import())
+
+
+def export_students_command(args):
+    filters = dict(item.split("=", 1) for item in args.filter)
+    query_params = validate_and_build_query_params(
+        filters, STUDENT_QUERY_PARAMS + USER_QUERY_PARAMS + ENROLLMENT_RECORD_PARAMS
+    )
+    chunks = iter_student_export(
+        args.format, parse_student_fields(args.fields), **query_params
+    )
+    # Written page by page, so memory stays flat whatever the cohort size
+    with open(args.output, "w", newline="", encoding="utf-8") as output:
+        for chunk in chunks:
+            output.write(chunk)
+    logger.info(f"Students exported to {args.output}")
+
+
+def filter_argument(value):
+    if "=" not in value:
+        raise argparse.ArgumentTypeError("filters must be given as key=value")
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Portal backend maintenance tasks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser(
+        "export-school-snapshot",
+        help="Export the school directory into the bundled SQLite snapshot",
+    )
+    export_parser.add_argument("--output", default=str(SCHOOL_SNAPSHOT_PATH))
+    export_parser.set_defaults(func=export_school_snapshot_command)
+
+    compile_parser = subparsers.add_parser(
+        "compile-forms",
+        help="Compile enhanced form schemas per auth group for bundling",
+    )
+    compile_parser.add_argument("--form-id", action="append", required=True)
+    compile_parser.add_argument(
+        "--auth-group",
+        action="append",
+        help="Auth group to compile for (default: every mapped auth group)",
+    )
+    compile_parser.add_argument("--locale", choices=SUPPORTED_LOCALES)
+    compile_parser.add_argument("--lazy", action="store_true")
+    compile_parser.add_argument("--output", default=str(COMPILED_FORMS_DIR))
+    compile_parser.set_defaults(func=compile_forms_command)
+
+    import_parser = subparsers.add_parser(
+        "import-students",
+        help="Create students from a CSV or NDJSON file, printing NDJSON results",
+    )
+    import_parser.add_argument("--file", required=True)
+    import_parser.add_argument("--auth-group", required=True)
+    import_parser.add_argument(
+        "--format",
+        choices=IMPORT_FORMATS,
+        help="File format (default: from the file extension)",
+    )
+    import_parser.add_argument("--id-generation", action="store_true")
+    import_parser.add_argument("--dry-run", action="store_true")
+    import_parser.set_defaults(func=import_students_command)
+
+    export_students_parser = subparsers.add_parser(
+        "export-students",
+        help="Export students matching filters to an NDJSON or CSV file",
+    )
+    export_students_parser.add_argument("--output", required=True)
+    export_students_parser.add_argument(
+        "--format", choices=EXPORT_FORMATS, default="ndjson"
+    )
+    export_students_parser.add_argument("--fields", help="Comma separated fields")
+    export_students_parser.add_argument(
+        "--filter",
+        action="append",
+        default=[],
+        type=filter_argument,
+        help="Student filter as key=value, e.g. grade=11 (repeatable)",
+    )
+    export_students_parser.set_defaults(func=export_students_command)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
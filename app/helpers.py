@@ -1,10 +1,15 @@
+import base64
+import json
 from fastapi import HTTPException
 from logger_config import get_logger
 from settings import settings
-from typing import Any, List, Dict, Union
+from typing import Any, List, Dict, Optional, Union
 
 logger = get_logger()
 
+# Locales that form option lists are provided in
+SUPPORTED_LOCALES = ["en", "hi"]
+
 
 def is_response_valid(response, error_message=""):
     """Enhanced response validation with better error context"""
@@ -106,3 +111,51 @@ def validate_and_build_query_params(data, valid_query_params):
 
 def db_request_token():
     return {"Authorization": f"Bearer {settings.TOKEN}"}
+
+
+def encode_keyset_cursor(position: Dict[str, Any]) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor."""
+    payload = json.dumps(position, sort_keys=True).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def decode_keyset_cursor(
+    cursor: Optional[str], keys: List[str]
+) -> Optional[Dict[str, Any]]:
+    """Decode a keyset cursor, checking it holds every sort key."""
+    if not cursor:
+        return None
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+    if not isinstance(position, dict) or any(key not in position for key in keys):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return position
+
+
+def validate_page_limit(limit: Optional[int], max_limit: int) -> Optional[int]:
+    """Validate a requested page size against the hard maximum."""
+    if limit is None:
+        return None
+    if limit < 1 or limit > max_limit:
+        raise HTTPException(
+            status_code=400, detail=f"limit must be between 1 and {max_limit}"
+        )
+    return limit
+
+
+def validate_locale(locale: Optional[str]) -> Optional[str]:
+    """Validate an optional locale query parameter."""
+    if locale is not None and locale not in SUPPORTED_LOCALES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"locale must be one of: {', '.join(SUPPORTED_LOCALES)}",
+        )
+    return locale
+
+
+def localize(value: Any, locale: Optional[str] = None) -> Dict[str, Any]:
+    """Key a language-independent value by every supported locale, or just one."""
+    locales = [locale] if locale else SUPPORTED_LOCALES
+    return {language: value for language in locales}
@@ -0,0 +1,228 @@
+import asyncio
+import functools
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from fastapi import HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from logger_config import get_logger
+from settings import settings
+
+logger = get_logger()
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+# How long a claimed key blocks other requests if its request never finishes;
+# matches the Lambda timeout
+IDEMPOTENCY_LEASE_SECONDS = 30
+# How long a retry waits for the first request before giving up with a 409
+IDEMPOTENCY_WAIT_SECONDS = 10
+IDEMPOTENCY_POLL_SECONDS = 0.5
+
+
+class _DynamoDBStore:
+    """Idempotency records in a DynamoDB table, shared by every Lambda container."""
+
+    def __init__(self, table_name: str):
+        # Only needed when an idempotency table is configured
+        import boto3
+
+        self.table = boto3.resource("dynamodb").Table(table_name)
+        self.conflict = (
+            self.table.meta.client.exceptions.ConditionalCheckFailedException
+        )
+
+    def claim(self, pk: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Claim a key, or return its record if another request holds it."""
+        now = int(time.time())
+        try:
+            self.table.put_item(
+                Item={
+                    "pk": pk,
+                    "fingerprint": fingerprint,
+                    "status": "in_progress",
+                    "lease_until": now + IDEMPOTENCY_LEASE_SECONDS,
+                    "expires_at": now + settings.IDEMPOTENCY_TTL_SECONDS,
+                },
+                # Expired items linger until DynamoDB's TTL sweep removes them
+                ConditionExpression=(
+                    "attribute_not_exists(pk) OR expires_at < :now OR "
+                    "(#status = :in_progress AND lease_until < :now)"
+                ),
+                ExpressionAttributeNames={"#status": "status"},
+                ExpressionAttributeValues={":now": now, ":in_progress": "in_progress"},
+            )
+            return None
+        except self.conflict:
+            item = self.table.get_item(Key={"pk": pk}, ConsistentRead=True).get("Item")
+            # Released between the put and the read: claim again
+            return item or self.claim(pk, fingerprint)
+
+    def get(self, pk: str) -> Optional[Dict[str, Any]]:
+        return self.table.get_item(Key={"pk": pk}, ConsistentRead=True).get("Item")
+
+    def complete(self, pk: str, fingerprint: str, result: str):
+        self.table.put_item(
+            Item={
+                "pk": pk,
+                "fingerprint": fingerprint,
+                "status": "done",
+                "result": result,
+                "expires_at": int(time.time()) + settings.IDEMPOTENCY_TTL_SECONDS,
+            }
+        )
+
+    def release(self, pk: str):
+        self.table.delete_item(Key={"pk": pk})
+
+
+class _LocalStore:
+    """In-process fallback for local development, where there is one process."""
+
+    def __init__(self):
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+
+    def claim(self, pk: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self.lock:
+            record = self.records.get(pk)
+            if (
+                record is not None
+                and record["expires_at"] >= now
+                and not (
+                    record["status"] == "in_progress" and record["lease_until"] < now
+                )
+            ):
+                return record
+            self.records[pk] = {
+                "fingerprint": fingerprint,
+                "status": "in_progress",
+                "lease_until": now + IDEMPOTENCY_LEASE_SECONDS,
+                "expires_at": now + settings.IDEMPOTENCY_TTL_SECONDS,
+            }
+            return None
+
+    def get(self, pk: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            return self.records.get(pk)
+
+    def complete(self, pk: str, fingerprint: str, result: str):
+        with self.lock:
+            self.records[pk] = {
+                "fingerprint": fingerprint,
+                "status": "done",
+                "result": result,
+                "expires_at": time.time() + settings.IDEMPOTENCY_TTL_SECONDS,
+            }
+
+    def release(self, pk: str):
+        with self.lock:
+            self.records.pop(pk, None)
+
+
+_store = None
+
+
+def _get_store():
+    global _store
+    if _store is None:
+        if settings.IDEMPOTENCY_TABLE:
+            _store = _DynamoDBStore(settings.IDEMPOTENCY_TABLE)
+        else:
+            logger.warning(
+                "IDEMPOTENCY_TABLE is not set, idempotency keys are only "
+                "honoured within this process"
+            )
+            _store = _LocalStore()
+    return _store
+
+
+def _store_key(request: Request, key: str, body: bytes) -> str:
+    """
+    Scope a key to the endpoint and the caller (the auth group the request is
+    made for, and its Authorization header if any), so two callers can't
+    collide on the same key.
+    """
+    try:
+        data = json.loads(body)
+    except ValueError:
+        data = None
+    auth_group = data.get("auth_group") if isinstance(data, dict) else None
+    scope = [
+        request.url.path,
+        str(auth_group or ""),
+        request.headers.get("Authorization", ""),
+        key,
+    ]
+    return hashlib.sha256("\n".join(scope).encode()).hexdigest()
+
+
+def _check_fingerprint(key: str, fingerprint: str, stored_fingerprint: str):
+    if fingerprint != stored_fingerprint:
+        raise HTTPException(
+            status_code=422,
+            detail=f"{IDEMPOTENCY_HEADER} '{key}' was already used with a different request body",
+        )
+
+
+def idempotent(endpoint: Callable) -> Callable:
+    """
+    Make a create endpoint honour the Idempotency-Key header.
+
+    The first request with a key claims it in the shared store (DynamoDB, see
+    IDEMPOTENCY_TABLE) and stores its result for IDEMPOTENCY_TTL_SECONDS. A
+    retry with the same key and body, on any container, gets that result, or
+    waits for it while the first request is still running and gets a 409 if
+    it doesn't finish in time. Failed requests release the key, so they can
+    be retried.
+    """
+
+    @functools.wraps(endpoint)
+    async def wrapper(request: Request, *args, **kwargs) -> Any:
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return await endpoint(request, *args, **kwargs)
+
+        body = await request.body()
+        pk = _store_key(request, key, body)
+        fingerprint = hashlib.sha256(body).hexdigest()
+        store = _get_store()
+
+        deadline = time.monotonic() + IDEMPOTENCY_WAIT_SECONDS
+        record = await asyncio.to_thread(store.claim, pk, fingerprint)
+        while record is not None:
+            _check_fingerprint(key, fingerprint, record["fingerprint"])
+            if record["status"] == "done":
+                logger.info(f"Returning stored result for {IDEMPOTENCY_HEADER}: {key}")
+                return json.loads(record["result"])
+            if time.monotonic() >= deadline:
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"A request with {IDEMPOTENCY_HEADER} '{key}' is still being processed",
+                )
+            logger.info(
+                f"Waiting for in-flight request with {IDEMPOTENCY_HEADER}: {key}"
+            )
+            await asyncio.sleep(IDEMPOTENCY_POLL_SECONDS)
+            record = await asyncio.to_thread(store.get, pk)
+            if record is None:
+                # The first request failed and released the key
+                record = await asyncio.to_thread(store.claim, pk, fingerprint)
+
+        try:
+            result = await endpoint(request, *args, **kwargs)
+        except Exception:
+            await asyncio.to_thread(store.release, pk)
+            raise
+
+        try:
+            await asyncio.to_thread(
+                store.complete, pk, fingerprint, json.dumps(jsonable_encoder(result))
+            )
+        except Exception as e:
+            logger.error(f"Could not store result for {IDEMPOTENCY_HEADER} {key}: {e}")
+        return result
+
+    return wrapper
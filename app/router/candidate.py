@@ -12,6 +12,7 @@ from mapping import (
     CANDIDATE_QUERY_PARAMS,
     ENROLLMENT_RECORD_PARAMS,
 )
+from idempotency import idempotent
 from logger_config import get_logger
 from services.candidate_service import (
     create_candidate as create_candidate_service,
@@ -54,5 +55,6 @@ async def verify_candidate(request: Request, candidate_id: str):
 
 
 @router.post("/")
+@idempotent
 async def create_candidate(request: Request):
     return await create_candidate_service(request)
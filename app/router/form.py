@@ -1,10 +1,20 @@
-from fastapi import APIRouter, Request, HTTPException
+import asyncio
+import json
+from fastapi import APIRouter, Request, HTTPException, Response
 from services.form_service import (
     get_form_schema_with_enhancement,
     get_student_fields_for_form,
+    get_profile_completeness_for_group,
+)
+from services.compiled_form_service import (
+    FORM_BATCH_MAX_IDS,
+    FORM_COMPILE_MAX_PAIRS,
+    compile_forms,
+    get_form_artifact,
+    get_form_artifacts,
 )
 from mapping import FORM_SCHEMA_QUERY_PARAMS
-from helpers import validate_and_build_query_params
+from helpers import validate_and_build_query_params, validate_locale
 from logger_config import get_logger
 
 router = APIRouter(prefix="/form-schema", tags=["Form"])
@@ -17,11 +27,17 @@ def get_form_schema(request: Request):
     """
     Get form schema, enhanced with dynamic data by default.
     auth_group parameter enables district/school mapping enhancement.
+    locale parameter (en/hi) returns option lists for that language only.
+    lazy=true embeds district options only, with URLs to fetch block/school
+    options for one parent value on demand.
+    Lookups by id with an auth_group are served from compiled form artifacts.
     """
     auth_group = request.query_params.get("auth_group")
+    locale = validate_locale(request.query_params.get("locale"))
+    lazy = request.query_params.get("lazy", "").lower() == "true"
     filtered_params = dict(request.query_params)
-    if "auth_group" in filtered_params:
-        del filtered_params["auth_group"]
+    for param in ["auth_group", "locale", "lazy"]:
+        filtered_params.pop(param, None)
 
     query_params = validate_and_build_query_params(
         filtered_params, FORM_SCHEMA_QUERY_PARAMS
@@ -31,7 +47,82 @@ def get_form_schema(request: Request):
         f"Fetching form schema with params: {query_params}, auth_group: {auth_group}"
     )
 
-    return get_form_schema_with_enhancement(auth_group=auth_group, **query_params)
+    if auth_group and list(query_params) == ["id"]:
+        artifact = get_form_artifact(query_params["id"], auth_group, locale, lazy)
+        return Response(
+            content=artifact.body,
+            media_type="application/json",
+            headers={"ETag": f'"{artifact.version}"'},
+        )
+
+    return get_form_schema_with_enhancement(
+        auth_group=auth_group, locale=locale, lazy=lazy, **query_params
+    )
+
+
+@router.get("/batch")
+async def get_form_schema_batch(
+    ids: str, auth_group: str, locale: str = None, lazy: bool = False
+):
+    """
+    Get several enhanced form schemas in one request, e.g.
+    /form-schema/batch?ids=1,2,3&auth_group=HaryanaStudents
+    Returns {"forms": {id: form}, "errors": {id: detail}}.
+    """
+    form_ids = [form_id.strip() for form_id in ids.split(",") if form_id.strip()]
+    if not form_ids or len(form_ids) > FORM_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"ids must list between 1 and {FORM_BATCH_MAX_IDS} form ids",
+        )
+
+    logger.info(f"Fetching form schema batch {form_ids}, auth_group: {auth_group}")
+    result = await get_form_artifacts(
+        form_ids, auth_group, validate_locale(locale), lazy
+    )
+
+    # Splice the pre-serialized form bodies into the response
+    forms = b",".join(
+        json.dumps(form_id).encode() + b":" + artifact.body
+        for form_id, artifact in result["forms"].items()
+    )
+    errors = json.dumps(result["errors"], ensure_ascii=False).encode("utf-8")
+    return Response(
+        content=b'{"forms":{' + forms + b'},"errors":' + errors + b"}",
+        media_type="application/json",
+    )
+
+
+@router.post("/compile")
+async def compile_form_schemas(request: Request):
+    """
+    Compile enhanced form schemas into this container's cache. Body:
+    {"form_ids": [...], "auth_groups": [...], "locale": "en", "lazy": false}
+    At most FORM_COMPILE_MAX_PAIRS (form, auth group) pairs per request;
+    compile larger sets with `python cli.py compile-forms`.
+    """
+    data = await request.json()
+    form_ids = data.get("form_ids")
+    auth_groups = data.get("auth_groups")
+    if not isinstance(form_ids, list) or not form_ids:
+        raise HTTPException(status_code=400, detail="form_ids is required")
+    if not isinstance(auth_groups, list) or not auth_groups:
+        raise HTTPException(status_code=400, detail="auth_groups is required")
+    if len(form_ids) * len(auth_groups) > FORM_COMPILE_MAX_PAIRS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {FORM_COMPILE_MAX_PAIRS} form and auth group pairs can be compiled per request",
+        )
+
+    return {
+        "compiled": await asyncio.to_thread(
+            compile_forms,
+            [str(form_id) for form_id in form_ids],
+            [str(auth_group) for auth_group in auth_groups],
+            locale=validate_locale(data.get("locale")),
+            lazy=bool(data.get("lazy", False)),
+        )
+    }
 
 
 @router.get("/student")
@@ -55,9 +146,29 @@ async def get_student_fields(request: Request):
         f"Getting student fields for form: {query_params['form_id']}, {identifier_type}: {student_identifier}"
     )
 
-    return get_student_fields_for_form(
+    return await get_student_fields_for_form(
         query_params["form_id"],
         student_identifier,
         int(query_params["number_of_fields_in_popup_form"]),
         identifier_type,
     )
+
+
+@router.get("/completeness")
+def get_profile_completeness(
+    form_id: str,
+    batch_id: str = None,
+    group_id: str = None,
+    group_type: str = None,
+):
+    """
+    Get missing form fields for every student of a batch (batch_id) or of an
+    enrollment group (group_id and group_type).
+    """
+    logger.info(
+        f"Getting profile completeness for form: {form_id}, batch_id: {batch_id}, group_id: {group_id}"
+    )
+
+    return get_profile_completeness_for_group(
+        form_id, batch_id=batch_id, group_id=group_id, group_type=group_type
+    )
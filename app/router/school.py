@@ -1,6 +1,12 @@
-from fastapi import APIRouter, Request
-from helpers import validate_and_build_query_params
-from mapping import SCHOOL_QUERY_PARAMS, USER_QUERY_PARAMS
+import json
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from helpers import (
+    validate_and_build_query_params,
+    validate_locale,
+    validate_page_limit,
+)
+from mapping import SCHOOL_QUERY_PARAMS, USER_QUERY_PARAMS, authgroup_state_mapping
 from services.school_service import (
     get_school,
     verify_school_comprehensive,
@@ -8,6 +14,13 @@ from services.school_service import (
     get_blocks_by_filters,
     get_schools_for_dropdown_by_filters,
     get_dependant_field_mapping_for_auth_group,
+    SCHOOL_PAGE_MAX_LIMIT,
+)
+from services.school_directory_service import (
+    get_school_changes_since,
+    get_school_page,
+    get_dependant_options,
+    iter_schools_by_filters,
 )
 from logger_config import get_logger
 
@@ -49,15 +62,72 @@ def get_blocks(auth_group: str = None, state: str = None, district: str = None):
 
 @router.get("/schools")
 def get_schools_for_dropdown(
-    auth_group: str = None, state: str = None, district: str = None, block: str = None
+    auth_group: str = None,
+    state: str = None,
+    district: str = None,
+    block: str = None,
+    limit: int = None,
+    cursor: str = None,
+    format: str = "json",
 ):
-    """Get list of schools for dropdown"""
+    """
+    Get list of schools for dropdown.
+    Pass limit/cursor to page through the list, or format=ndjson to stream it.
+    """
+    if format == "ndjson":
+        schools = iter_schools_by_filters(
+            auth_group=auth_group, state=state, district=district, block=block
+        )
+        return StreamingResponse(
+            (json.dumps(school) + "\n" for school in schools),
+            media_type="application/x-ndjson",
+        )
+    if format != "json":
+        raise HTTPException(status_code=400, detail="format must be json or ndjson")
+
+    if limit is not None or cursor:
+        return get_school_page(
+            auth_group=auth_group,
+            state=state,
+            district=district,
+            block=block,
+            limit=validate_page_limit(limit, SCHOOL_PAGE_MAX_LIMIT),
+            cursor=cursor,
+        )
     return get_schools_for_dropdown_by_filters(
         auth_group=auth_group, state=state, district=district, block=block
     )
 
 
+@router.get("/changes")
+def get_school_changes(since: str = None, state: str = None, auth_group: str = None):
+    """Get schools added, changed or removed in a state since a version token"""
+    if auth_group and auth_group in authgroup_state_mapping:
+        state = authgroup_state_mapping[auth_group]
+    if not state:
+        raise HTTPException(status_code=400, detail="state or auth_group is required")
+
+    return get_school_changes_since(state, since)
+
+
 @router.get("/dependant-mapping/{auth_group}")
-def get_dependant_field_mapping(auth_group: str, include_blocks: bool = False):
+def get_dependant_field_mapping(
+    auth_group: str, include_blocks: bool = False, locale: str = None
+):
     """Generate dependantFieldMapping - thin router layer."""
-    return get_dependant_field_mapping_for_auth_group(auth_group, include_blocks)
+    return get_dependant_field_mapping_for_auth_group(
+        auth_group, include_blocks, validate_locale(locale)
+    )
+
+
+@router.get("/dependant-options/{auth_group}")
+def get_dependant_field_options(
+    auth_group: str, field: str, parent: str, value: str, locale: str = None
+):
+    """
+    Get the options of one dependant field for a single parent value, e.g.
+    /school/dependant-options/HaryanaStudents?field=school_name&parent=district&value=Karnal
+    """
+    return get_dependant_options(
+        auth_group, field, parent, value, validate_locale(locale)
+    )
@@ -1,19 +1,30 @@
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Response
 import requests
 from services.student_service import (
     create_student as create_student_service,
     verify_student_comprehensive,
+    verify_students_bulk,
     complete_profile_details_service,
     patch_student_service,
+    STUDENT_PAGE_MAX_LIMIT,
+    check_student_listing_size,
+    get_students_paginated,
+    iter_student_export,
+    parse_student_fields,
+    project_student_record,
+    update_students_bulk,
 )
 from routes import student_db_url
 from helpers import (
     db_request_token,
     validate_and_build_query_params,
+    validate_page_limit,
     is_response_valid,
     is_response_empty,
 )
+from idempotency import idempotent
 from logger_config import get_logger
+from settings import settings
 from mapping import (
     USER_QUERY_PARAMS,
     STUDENT_QUERY_PARAMS,
@@ -24,29 +35,95 @@ router = APIRouter(prefix="/student", tags=["Student"])
 logger = get_logger()
 
 
+# Listing parameters of GET /student that are not student filters
+LISTING_PARAMS = ["limit", "cursor", "fields"]
+EXPORT_PARAMS = ["format", "fields"]
+
+
 @router.get("/")
-def get_students(request: Request):
+def get_students(
+    request: Request, limit: int = None, cursor: str = None, fields: str = None
+):
+    """
+    Get students matching the filters, at most STUDENT_PAGE_MAX_LIMIT (a 400
+    if more match). Pass limit/cursor to page through them
+    ({"students": [...], "next_cursor": ...}) and fields=a,b,c to get flat
+    records with only those fields.
+    """
     query_params = validate_and_build_query_params(
-        request.query_params,
+        {k: v for k, v in request.query_params.items() if k not in LISTING_PARAMS},
         STUDENT_QUERY_PARAMS + USER_QUERY_PARAMS + ENROLLMENT_RECORD_PARAMS,
     )
+    field_list = parse_student_fields(fields)
+
+    if limit is not None or cursor:
+        return get_students_paginated(
+            limit=validate_page_limit(limit, STUDENT_PAGE_MAX_LIMIT),
+            cursor=cursor,
+            fields=field_list,
+            **query_params,
+        )
 
     logger.info(f"Fetching students with params: {query_params}")
 
+    # One row past the maximum tells whether more students match
     response = requests.get(
-        student_db_url, params=query_params, headers=db_request_token()
+        student_db_url,
+        params={**query_params, "limit": STUDENT_PAGE_MAX_LIMIT + 1},
+        headers=db_request_token(),
     )
 
     if is_response_valid(response, "Student API could not fetch the student!"):
         students_data = is_response_empty(
             response.json(), False, "Student does not exist"
         )
+        check_student_listing_size(students_data)
         logger.info(
             f"Successfully retrieved {len(students_data) if isinstance(students_data, list) else 1} student(s)"
         )
+        if field_list and isinstance(students_data, list):
+            return [
+                project_student_record(student, field_list) for student in students_data
+            ]
         return students_data
 
 
+@router.get("/export")
+def export_students(request: Request, format: str = "ndjson", fields: str = None):
+    """
+    Export the students matching the filters as NDJSON or CSV. At least one
+    filter is required, and at most STUDENT_EXPORT_MAX_ROWS students are
+    exported; larger exports run from `python cli.py export-students`.
+    Pass fields=a,b,c to choose the columns.
+    """
+    query_params = validate_and_build_query_params(
+        {k: v for k, v in request.query_params.items() if k not in EXPORT_PARAMS},
+        STUDENT_QUERY_PARAMS + USER_QUERY_PARAMS + ENROLLMENT_RECORD_PARAMS,
+    )
+    if not query_params:
+        raise HTTPException(
+            status_code=400, detail="At least one filter is required to export students"
+        )
+
+    logger.info(f"Exporting students as {format} with params: {query_params}")
+    # API Gateway buffers the response anyway, so it is built in full here
+    content = "".join(
+        iter_student_export(
+            format,
+            parse_student_fields(fields),
+            max_rows=settings.STUDENT_EXPORT_MAX_ROWS,
+            **query_params,
+        )
+    )
+    if format == "csv":
+        return Response(
+            content=content,
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="students.csv"'},
+        )
+    return Response(content=content, media_type="application/x-ndjson")
+
+
 @router.get("/verify")
 async def verify_student(request: Request):
     query_params = validate_and_build_query_params(
@@ -57,7 +134,29 @@ async def verify_student(request: Request):
     return await verify_student_comprehensive(query_params)
 
 
+@router.post("/verify/bulk")
+async def verify_students(request: Request):
+    """
+    Verify a list of students, e.g. a class roster. Body:
+    {"items": [{"student_id": "...", "auth_group_id": "..."}, ...]}
+    Returns one /student/verify result per item, with its index.
+    """
+    data = await request.json()
+    items = data.get("items") if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        raise HTTPException(status_code=400, detail="items must be a non-empty list")
+    if len(items) > settings.STUDENT_VERIFY_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.STUDENT_VERIFY_BULK_MAX_ITEMS} items can be verified at once",
+        )
+
+    logger.info(f"Bulk verifying {len(items)} students")
+    return {"results": await verify_students_bulk(items)}
+
+
 @router.post("/")
+@idempotent
 async def create_student(request: Request):
     return await create_student_service(request)
 
@@ -74,8 +173,31 @@ async def update_student(request: Request):
         raise HTTPException(status_code=500, detail="Error updating student")
 
 
+@router.patch("/bulk")
+async def update_students(request: Request):
+    """
+    Apply partial profile updates to many students. Body:
+    {"items": [{"student_id": "...", "guardian_name": "...", ...}, ...]}
+    An item may carry the "version" it was read at to get a conflict instead
+    of overwriting a newer change. Returns one result per item, with its index.
+    """
+    data = await request.json()
+    items = data.get("items") if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        raise HTTPException(status_code=400, detail="items must be a non-empty list")
+    if len(items) > settings.STUDENT_UPDATE_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.STUDENT_UPDATE_BULK_MAX_ITEMS} items can be updated at once",
+        )
+
+    logger.info(f"Bulk updating {len(items)} students")
+    return {"results": await update_students_bulk(items)}
+
+
 @router.post("/complete-profile-details")
 async def complete_profile_details(request: Request):
+    """Update a student's profile by user_id, student_id or apaar_id."""
     try:
         data = await request.json()
         return await complete_profile_details_service(data)
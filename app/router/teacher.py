@@ -17,6 +17,7 @@ from services.teacher_service import (
     verify_teacher_comprehensive,
     create_teacher as create_teacher_service,
 )
+from idempotency import idempotent
 from logger_config import get_logger
 
 router = APIRouter(prefix="/teacher", tags=["Teacher"])
@@ -58,5 +59,6 @@ async def verify_teacher(request: Request, teacher_id: str):
 
 
 @router.post("/")
+@idempotent
 async def create_teacher(request: Request):
     return await create_teacher_service(request)
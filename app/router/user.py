@@ -18,6 +18,7 @@ from mapping import (
     TEACHER_QUERY_PARAMS,
     CANDIDATE_QUERY_PARAMS,
 )
+from idempotency import idempotent
 from logger_config import get_logger
 
 router = APIRouter(prefix="/user", tags=["User"])
@@ -45,6 +46,7 @@ def get_users(request: Request):
 
 
 @router.post("/")
+@idempotent
 async def create_user(request: Request):
     try:
         data = await request.json()
@@ -2,17 +2,21 @@
 
 import requests
 from typing import Dict, Any, Optional
+from cache import TTLCache
 from logger_config import get_logger
 from routes import auth_group_db_url
 from helpers import db_request_token, is_response_valid, safe_get_first_item
 from mapping import AUTH_GROUP_QUERY_PARAMS
+from settings import settings
 
 logger = get_logger()
 
+_auth_group_cache = TTLCache(ttl_seconds=settings.REFERENCE_DATA_TTL_SECONDS)
+
 
 def get_auth_group_by_name(name: str) -> Optional[Dict[str, Any]]:
-    """Get auth group by name."""
-    return get_auth_group(name=name)
+    """Get auth group by name, cached as auth groups rarely change."""
+    return _auth_group_cache.get_or_set(name, lambda: get_auth_group(name=name))
 
 
 def get_auth_group_by_id(auth_group_id: str) -> Optional[Dict[str, Any]]:
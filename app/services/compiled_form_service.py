@@ -0,0 +1,379 @@
+"""Compiled form schemas: the enhanced form of a (form, auth group) pair,
+serialized once and served as bytes.
+
+Artifacts are compiled ahead of time into `app/data/compiled_forms/` (see
+`python cli.py compile-forms`), on demand via `POST /form-schema/compile`, or
+on the first request for a pair, and then kept in memory per container.
+
+Each artifact records the version of every source it was built from (the form
+row, a state's school directory, the static college/state lists), and is
+checked against the current version of each before it is served: the form row
+is read from the DB service on every request, and school directories are the
+cached directory, which is reloaded from the DB service (or a snapshot checked
+against it) once its TTL expires.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
+from cache import TTLCache
+from fastapi import HTTPException
+from logger_config import get_logger
+from mapping import authgroup_state_mapping
+from services.form_service import (
+    COLLEGES_SOURCE,
+    SCHOOL_SOURCE_PREFIX,
+    STATES_SOURCE,
+    EnhancementContext,
+    enhance_form_schema_with_dynamic_data,
+    form_source,
+    get_form_schema,
+)
+from services.school_directory_service import get_school_directory
+from services.school_service import get_colleges_list, get_states_list
+from settings import settings
+
+logger = get_logger()
+
+APP_DIR = Path(__file__).resolve().parent.parent
+COMPILED_FORMS_DIR = APP_DIR / "data" / "compiled_forms"
+MANIFEST_NAME = "manifest.json"
+FORM_BATCH_MAX_IDS = 20
+# (form, auth group) pairs compiled by one POST /form-schema/compile
+FORM_COMPILE_MAX_PAIRS = 20
+
+_artifact_cache = TTLCache(
+    ttl_seconds=settings.COMPILED_FORM_TTL_SECONDS, max_entries=500
+)
+_bundled_manifest = None
+_manifest_lock = threading.Lock()
+
+# The static lists are defined in code, so they only change with a deploy
+_static_source_versions: Dict[str, str] = {}
+STATIC_SOURCES = {COLLEGES_SOURCE: get_colleges_list, STATES_SOURCE: get_states_list}
+
+
+class FormArtifact(NamedTuple):
+    key: str
+    version: str
+    compiled_at: str
+    body: bytes
+    sources: Dict[str, str]
+    # Sources whose data could not be fetched; such artifacts are served once
+    # but never cached or bundled
+    failed_sources: Tuple[str, ...] = ()
+
+
+def artifact_key(
+    form_id: str, auth_group: str, locale: Optional[str] = None, lazy: bool = False
+) -> str:
+    """Key (and file name stem) of the artifact for one form variant."""
+    return "__".join(
+        [str(form_id), auth_group, locale or "all", "lazy" if lazy else "full"]
+    )
+
+
+def _content_version(data: Any) -> str:
+    return hashlib.sha256(
+        json.dumps(data, sort_keys=True, default=str).encode()
+    ).hexdigest()[:16]
+
+
+def _current_source_version(source: str) -> Optional[str]:
+    """
+    Current version of a static list or a state's school directory, or None
+    if unknown. Form row versions come from the row itself (see _is_current).
+    """
+    if source in STATIC_SOURCES:
+        if source not in _static_source_versions:
+            _static_source_versions[source] = _content_version(STATIC_SOURCES[source]())
+        return _static_source_versions[source]
+    if source.startswith(SCHOOL_SOURCE_PREFIX):
+        directory = get_school_directory(source[len(SCHOOL_SOURCE_PREFIX) :])
+        return directory.version if directory else None
+    return None
+
+
+def _is_current(
+    artifact: FormArtifact, form_id: str, form_data: Dict[str, Any]
+) -> bool:
+    """
+    Check that an artifact was built from the form row as currently stored in
+    the DB service, and that none of its other sources has changed since.
+    """
+    row_source = form_source(form_id)
+    if artifact.sources.get(row_source) != _content_version(form_data):
+        return False
+    return all(
+        _current_source_version(source) in (None, version)
+        for source, version in artifact.sources.items()
+        if source != row_source
+    )
+
+
+def _cache_artifact(artifact: FormArtifact):
+    if artifact.failed_sources:
+        logger.warning(
+            f"Not caching form artifact {artifact.key}, could not fetch: "
+            f"{', '.join(artifact.failed_sources)}"
+        )
+        return
+    _artifact_cache.set(artifact.key, artifact)
+
+
+def compile_form(
+    form_id: str,
+    auth_group: str,
+    locale: Optional[str] = None,
+    lazy: bool = False,
+    form_data: Optional[Dict[str, Any]] = None,
+    context: Optional[EnhancementContext] = None,
+) -> FormArtifact:
+    """
+    Enhance a form for an auth group and serialize it as the API would. Pass
+    `form_data` if the form row is already fetched, and a shared `context` when
+    compiling several forms for the same auth group.
+    """
+    if form_data is None:
+        form_data = get_form_schema(id=form_id)
+    context = context or EnhancementContext()
+    context.sources.clear()
+    context.failed_sources.clear()
+
+    # Versioned before enhancement, which adds options to the row in place
+    sources = {form_source(form_id): _content_version(form_data)}
+
+    form_data = enhance_form_schema_with_dynamic_data(
+        form_data, auth_group, locale, lazy, context
+    )
+    for source in sorted(context.sources):
+        version = _current_source_version(source)
+        if version is not None:
+            sources[source] = version
+
+    # Same encoding as FastAPI's JSONResponse
+    body = json.dumps(
+        form_data, ensure_ascii=False, separators=(",", ":"), default=str
+    ).encode("utf-8")
+
+    return FormArtifact(
+        key=artifact_key(form_id, auth_group, locale, lazy),
+        version=hashlib.sha256(body).hexdigest()[:16],
+        compiled_at=datetime.now(timezone.utc).isoformat(),
+        body=body,
+        sources=sources,
+        failed_sources=tuple(sorted(context.failed_sources)),
+    )
+
+
+def _load_bundled_manifest() -> Dict[str, Dict[str, Any]]:
+    """Read the manifest of bundled artifacts, once per container."""
+    global _bundled_manifest
+
+    with _manifest_lock:
+        if _bundled_manifest is None:
+            manifest_path = COMPILED_FORMS_DIR / MANIFEST_NAME
+            try:
+                _bundled_manifest = json.loads(manifest_path.read_text())
+                logger.info(f"Loaded {len(_bundled_manifest)} compiled form artifacts")
+            except FileNotFoundError:
+                _bundled_manifest = {}
+            except (OSError, ValueError) as e:
+                logger.error(f"Could not read compiled form manifest: {e}")
+                _bundled_manifest = {}
+        return _bundled_manifest
+
+
+def _get_bundled_artifact(key: str) -> Optional[FormArtifact]:
+    """Get a bundled artifact if one exists and is younger than the max age."""
+    entry = _load_bundled_manifest().get(key)
+    if not entry:
+        return None
+
+    compiled_at = datetime.fromisoformat(entry["compiled_at"])
+    max_age = timedelta(hours=settings.COMPILED_FORM_MAX_AGE_HOURS)
+    if datetime.now(timezone.utc) - compiled_at > max_age:
+        return None
+
+    try:
+        body = (COMPILED_FORMS_DIR / f"{key}.json").read_bytes()
+    except OSError as e:
+        logger.error(f"Could not read compiled form {key}: {e}")
+        return None
+    return FormArtifact(
+        key, entry["version"], entry["compiled_at"], body, entry.get("sources", {})
+    )
+
+
+def get_form_artifact(
+    form_id: str, auth_group: str, locale: Optional[str] = None, lazy: bool = False
+) -> FormArtifact:
+    """
+    Get the artifact for a (form, auth group) pair from memory or the bundled
+    artifacts, enhancing the form at runtime only on a miss or when the form
+    row or another of its sources has changed.
+    """
+    form_data = get_form_schema(id=form_id)
+    key = artifact_key(form_id, auth_group, locale, lazy)
+    artifact = _artifact_cache.get(key) or _get_bundled_artifact(key)
+    if artifact is not None and not _is_current(artifact, form_id, form_data):
+        logger.info(f"Form artifact {key} is out of date")
+        artifact = None
+    if artifact is None:
+        logger.info(f"Form artifact miss for {key}, enhancing at runtime")
+        artifact = compile_form(form_id, auth_group, locale, lazy, form_data)
+    _cache_artifact(artifact)
+    return artifact
+
+
+def _get_artifacts_for_rows(
+    form_rows: Dict[str, Any],
+    auth_group: str,
+    locale: Optional[str] = None,
+    lazy: bool = False,
+) -> Dict[str, Any]:
+    """
+    Get artifacts for fetched form rows (or the exceptions raised fetching
+    them), enhancing out of date forms with a shared context.
+    """
+    artifacts = {}
+    errors = {}
+    misses = []
+    for form_id, form_data in form_rows.items():
+        if isinstance(form_data, HTTPException):
+            errors[form_id] = form_data.detail
+            continue
+        if isinstance(form_data, Exception):
+            raise form_data
+
+        key = artifact_key(form_id, auth_group, locale, lazy)
+        artifact = _artifact_cache.get(key) or _get_bundled_artifact(key)
+        if artifact is None or not _is_current(artifact, form_id, form_data):
+            misses.append((form_id, form_data))
+        else:
+            artifacts[form_id] = artifact
+
+    context = EnhancementContext()
+    for form_id, form_data in misses:
+        artifacts[form_id] = compile_form(
+            form_id, auth_group, locale, lazy, form_data, context
+        )
+
+    for artifact in artifacts.values():
+        _cache_artifact(artifact)
+    logger.info(
+        f"Served {len(artifacts)} forms for {auth_group}, {len(misses)} compiled"
+    )
+    return {"forms": artifacts, "errors": errors}
+
+
+async def get_form_artifacts(
+    form_ids: List[str],
+    auth_group: str,
+    locale: Optional[str] = None,
+    lazy: bool = False,
+) -> Dict[str, Any]:
+    """
+    Get the artifacts of several forms for one auth group. Form rows are
+    fetched concurrently to check the artifacts against, and out of date forms
+    are enhanced with a shared context, so dynamic data is fetched once for
+    the whole batch. Returns artifacts and errors by form id.
+    """
+    form_ids = list(dict.fromkeys(form_ids))
+    form_rows = await asyncio.gather(
+        *[asyncio.to_thread(get_form_schema, id=form_id) for form_id in form_ids],
+        return_exceptions=True,
+    )
+    # Checking artifacts and enhancing forms call the DB service and read
+    # bundled files, so they run off the event loop
+    return await asyncio.to_thread(
+        _get_artifacts_for_rows,
+        dict(zip(form_ids, form_rows)),
+        auth_group,
+        locale,
+        lazy,
+    )
+
+
+def _write_artifacts(compiled_forms: List[FormArtifact], output_dir: Path):
+    """Write artifact bodies and merge their entries into the manifest."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_NAME
+    manifest = {}
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+
+    for compiled in compiled_forms:
+        (output_dir / f"{compiled.key}.json").write_bytes(compiled.body)
+        manifest[compiled.key] = {
+            "version": compiled.version,
+            "compiled_at": compiled.compiled_at,
+            "sources": compiled.sources,
+        }
+
+    tmp_path = manifest_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(tmp_path, manifest_path)
+
+
+def compile_forms(
+    form_ids: List[str],
+    auth_groups: Optional[List[str]] = None,
+    locale: Optional[str] = None,
+    lazy: bool = False,
+    output_dir: Optional[Path] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Compile every (form, auth group) pair into the in-memory cache, and into
+    `output_dir` when given. Auth groups default to every mapped auth group.
+    Pairs whose dynamic data could not be fetched are reported as errors.
+    """
+    auth_groups = auth_groups or list(authgroup_state_mapping)
+    compiled_forms = []
+    results = []
+
+    for auth_group in auth_groups:
+        context = EnhancementContext()
+        for form_id in form_ids:
+            try:
+                compiled = compile_form(
+                    form_id, auth_group, locale, lazy, context=context
+                )
+            except HTTPException as e:
+                logger.error(f"Could not compile form {form_id} for {auth_group}: {e}")
+                results.append(
+                    {"form_id": form_id, "auth_group": auth_group, "error": e.detail}
+                )
+                continue
+            if compiled.failed_sources:
+                error = f"Could not fetch {', '.join(compiled.failed_sources)}"
+                logger.error(
+                    f"Could not compile form {form_id} for {auth_group}: {error}"
+                )
+                results.append(
+                    {"form_id": form_id, "auth_group": auth_group, "error": error}
+                )
+                continue
+
+            _cache_artifact(compiled)
+            compiled_forms.append(compiled)
+            results.append(
+                {
+                    "form_id": form_id,
+                    "auth_group": auth_group,
+                    "key": compiled.key,
+                    "version": compiled.version,
+                    "size": len(compiled.body),
+                }
+            )
+
+    if output_dir is not None:
+        _write_artifacts(compiled_forms, Path(output_dir))
+
+    logger.info(f"Compiled {len(compiled_forms)} of {len(results)} form artifacts")
+    return results
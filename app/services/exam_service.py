@@ -1,13 +1,17 @@
 """Exam service for business logic without HTTP dependencies."""
 
 import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+from cache import TTLCache
 from logger_config import get_logger
 from routes import exam_db_url
 from helpers import db_request_token, is_response_valid, safe_get_first_item
+from settings import settings
 
 logger = get_logger()
 
+_exam_index_cache = TTLCache(ttl_seconds=settings.REFERENCE_DATA_TTL_SECONDS)
+
 
 def _exam_name_candidates(name: str) -> list:
     if not name:
@@ -42,6 +46,41 @@ def get_exam_by_name(name: str) -> Optional[Dict[str, Any]]:
     return None
 
 
+def _load_exam_name_index() -> Optional[Dict[str, Dict[str, Any]]]:
+    """Fetch every exam in one query and index them by name."""
+    logger.info("Loading exam name index")
+    response = requests.get(exam_db_url, headers=db_request_token())
+    if not is_response_valid(response):
+        return None
+
+    exams = response.json()
+    if not isinstance(exams, list):
+        return None
+    return {exam["name"]: exam for exam in exams if exam.get("name")}
+
+
+def get_exams_by_names(names: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Resolve a list of exam names in order, with the same name candidates as
+    get_exam_by_name, from a cached index of all exams. Names missing from the
+    index (e.g. exams added since it was loaded) are looked up one by one.
+    """
+    index = _exam_index_cache.get_or_set("names", _load_exam_name_index) or {}
+
+    exams = []
+    for name in names:
+        exam_data = next(
+            (
+                index[candidate]
+                for candidate in _exam_name_candidates(name)
+                if candidate in index
+            ),
+            None,
+        )
+        exams.append(exam_data or get_exam_by_name(name))
+    return exams
+
+
 def get_exam_by_id(exam_id: str) -> Optional[Dict[str, Any]]:
     """Get exam by ID."""
     return get_exam(id=exam_id)
@@ -1,10 +1,20 @@
 """Form service for business logic without HTTP dependencies."""
 
+import asyncio
 import requests
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, NamedTuple, Optional, Tuple
+from urllib.parse import urlencode
+from cache import TTLCache
 from logger_config import get_logger
 from routes import form_db_url
-from helpers import db_request_token, is_response_valid, safe_get_first_item
+from fastapi import HTTPException
+from helpers import (
+    db_request_token,
+    is_response_valid,
+    safe_get_first_item,
+    localize,
+)
 from mapping import (
     FORM_SCHEMA_QUERY_PARAMS,
     USER_QUERY_PARAMS,
@@ -17,11 +27,20 @@ from services.school_service import (
     get_districts_by_filters,
     get_dependant_field_mapping_for_auth_group,
 )
-from services.student_service import get_student_by_id, get_students
+from services.school_directory_service import get_dependant_districts
+from services.student_service import (
+    get_student_by_id_concurrently,
+    get_students,
+    iter_student_pages,
+)
+from services.batch_service import get_batch_by_id
 from services.user_service import get_user_by_id
+from settings import settings
 
 logger = get_logger()
 
+_compiled_form_cache = TTLCache(ttl_seconds=settings.FORM_SCHEMA_TTL_SECONDS)
+
 
 def get_form_schema_by_id(form_id: str) -> Optional[Dict[str, Any]]:
     """Get form schema by ID."""
@@ -52,29 +71,78 @@ def get_form_schema(**params) -> Optional[Dict[str, Any]]:
 
 
 def get_form_schema_with_enhancement(
-    auth_group: Optional[str] = None, **params
+    auth_group: Optional[str] = None,
+    locale: Optional[str] = None,
+    lazy: bool = False,
+    **params,
 ) -> Optional[Dict[str, Any]]:
     """Get form schema with optional dynamic data enhancement."""
     form_data = get_form_schema(**params)
 
     if form_data and auth_group:
-        form_data = enhance_form_schema_with_dynamic_data(form_data, auth_group)
+        form_data = enhance_form_schema_with_dynamic_data(
+            form_data, auth_group, locale, lazy
+        )
         logger.info("Successfully retrieved and enhanced form schema")
 
     return form_data
 
 
+# Sources of dynamic data that enhanced forms depend on
+COLLEGES_SOURCE = "colleges"
+STATES_SOURCE = "states"
+SCHOOL_SOURCE_PREFIX = "schools:"
+
+
+def school_source(state: str) -> str:
+    return f"{SCHOOL_SOURCE_PREFIX}{state}"
+
+
+def form_source(form_id: str) -> str:
+    return f"form:{form_id}"
+
+
+class EnhancementContext:
+    """
+    Dynamic data fetched while enhancing forms, memoized so that forms enhanced
+    together (e.g. a batch request) fetch each list or mapping only once.
+    `sources` collects the data sources used since it was last cleared, and
+    `failed_sources` those whose data could not be fetched, leaving the form
+    without their options.
+    """
+
+    def __init__(self):
+        self._results: Dict[Tuple, Any] = {}
+        self.sources = set()
+        self.failed_sources = set()
+
+    def fetch(self, source: str, func, *args, **kwargs) -> Any:
+        self.sources.add(source)
+        key = (func.__name__, args, tuple(sorted(kwargs.items())))
+        if key not in self._results:
+            self._results[key] = func(*args, **kwargs)
+        return self._results[key]
+
+
 def enhance_form_schema_with_dynamic_data(
-    form_data: Dict[str, Any], auth_group: str
+    form_data: Dict[str, Any],
+    auth_group: str,
+    locale: Optional[str] = None,
+    lazy: bool = False,
+    context: Optional[EnhancementContext] = None,
 ) -> Dict[str, Any]:
     """
     Enhance form schema with dynamic data from database.
     This replaces frontend form enhancement logic for better performance and reliability.
+    Option lists are added for every supported locale, or only for `locale` if given.
+    With `lazy`, dependant block/school fields get a URL to fetch their options
+    per parent value instead of the full dependantFieldMapping.
     """
     if not form_data or not form_data.get("attributes") or not auth_group:
         return form_data
 
     attributes = form_data["attributes"]
+    context = context or EnhancementContext()
 
     # Check what fields need enhancement
     needs_district_school = _has_field(attributes, "district") and _has_field(
@@ -98,14 +166,26 @@ def enhance_form_schema_with_dynamic_data(
     if auth_group in authgroup_state_mapping:
         state = authgroup_state_mapping[auth_group]
 
-        if needs_district_block_school:
-            _enhance_with_district_block_school_mapping(attributes, auth_group, state)
+        if lazy and (needs_district_block_school or needs_district_school):
+            _enhance_with_lazy_school_options(
+                attributes, context, auth_group, needs_district_block_school, locale
+            )
+        elif needs_district_block_school:
+            _enhance_with_district_block_school_mapping(
+                attributes, context, auth_group, state, locale
+            )
         elif needs_district_school:
-            _enhance_with_district_school_mapping(attributes, auth_group, state)
+            _enhance_with_district_school_mapping(
+                attributes, context, auth_group, state, locale
+            )
         elif _has_field(attributes, "district") and state == "Tamil Nadu":
-            _enhance_with_tamil_nadu_district_options(attributes, auth_group=auth_group)
+            _enhance_with_tamil_nadu_district_options(
+                attributes, context, auth_group=auth_group, locale=locale
+            )
     elif is_hiring_candidate_district_form:
-        _enhance_with_tamil_nadu_district_options(attributes, state="Tamil Nadu")
+        _enhance_with_tamil_nadu_district_options(
+            attributes, context, state="Tamil Nadu", locale=locale
+        )
     else:
         logger.warning(
             f"Unknown auth_group for school/district enhancement: {auth_group}"
@@ -113,15 +193,20 @@ def enhance_form_schema_with_dynamic_data(
 
     # These enhancements don't require auth_group mapping
     if needs_colleges:
-        _enhance_with_colleges(attributes)
+        _enhance_with_colleges(attributes, context, locale)
 
     if needs_states:
-        _enhance_with_states(attributes)
+        _enhance_with_states(attributes, context, locale)
 
     logger.info(f"Enhanced form schema for auth_group: {auth_group}")
     return form_data
 
 
+def _build_options(values: list, locale: Optional[str] = None) -> Dict[str, Any]:
+    """Build label/value dropdown options keyed by locale."""
+    return localize([{"label": value, "value": value} for value in values], locale)
+
+
 def _has_field(attributes: Dict[str, Any], field_key: str) -> bool:
     """Check if form has a specific field."""
     return any(attr.get("key") == field_key for attr in attributes.values())
@@ -139,20 +224,28 @@ def _find_field_by_key(
 
 def _enhance_with_district_school_mapping(
     attributes: Dict[str, Any],
+    context: EnhancementContext,
     auth_group: str,
-    state: str,  # state kept for API compatibility
+    state: str,
+    locale: Optional[str] = None,
 ):
     """Enhance form with district -> school mapping."""
+    source = school_source(state)
     try:
         # Get mapping data from school service
-        mapping_data = get_dependant_field_mapping_for_auth_group(
-            auth_group, include_blocks=False
+        mapping_data = context.fetch(
+            source,
+            get_dependant_field_mapping_for_auth_group,
+            auth_group,
+            include_blocks=False,
+            locale=locale,
         )
 
         if "error" in mapping_data:
             logger.error(
                 f"Failed to get district-school mapping: {mapping_data['error']}"
             )
+            context.failed_sources.add(source)
             return
 
         district_school_mapping = mapping_data["district_school_mapping"]
@@ -161,14 +254,7 @@ def _enhance_with_district_school_mapping(
         # Update district field options
         district_field = _find_field_by_key(attributes, "district")
         if district_field:
-            district_field["options"] = {
-                "en": [
-                    {"label": district, "value": district} for district in districts
-                ],
-                "hi": [
-                    {"label": district, "value": district} for district in districts
-                ],
-            }
+            district_field["options"] = _build_options(districts, locale)
 
         # Update school field with dependant mapping
         school_field = _find_field_by_key(attributes, "school_name")
@@ -181,24 +267,33 @@ def _enhance_with_district_school_mapping(
 
     except Exception as e:
         logger.error(f"Error enhancing district-school mapping: {e}")
+        context.failed_sources.add(source)
 
 
 def _enhance_with_district_block_school_mapping(
     attributes: Dict[str, Any],
+    context: EnhancementContext,
     auth_group: str,
-    state: str,  # state kept for API compatibility
+    state: str,
+    locale: Optional[str] = None,
 ):
     """Enhance form with district -> block -> school mapping."""
+    source = school_source(state)
     try:
         # Get mapping data from school service
-        mapping_data = get_dependant_field_mapping_for_auth_group(
-            auth_group, include_blocks=True
+        mapping_data = context.fetch(
+            source,
+            get_dependant_field_mapping_for_auth_group,
+            auth_group,
+            include_blocks=True,
+            locale=locale,
         )
 
         if "error" in mapping_data:
             logger.error(
                 f"Failed to get district-block-school mapping: {mapping_data['error']}"
             )
+            context.failed_sources.add(source)
             return
 
         district_block_mapping = mapping_data["district_block_mapping"]
@@ -208,14 +303,7 @@ def _enhance_with_district_block_school_mapping(
         # Update district field options
         district_field = _find_field_by_key(attributes, "district")
         if district_field:
-            district_field["options"] = {
-                "en": [
-                    {"label": district, "value": district} for district in districts
-                ],
-                "hi": [
-                    {"label": district, "value": district} for district in districts
-                ],
-            }
+            district_field["options"] = _build_options(districts, locale)
 
         # Update block field with dependant mapping
         block_field = _find_field_by_key(attributes, "block_name")
@@ -233,28 +321,87 @@ def _enhance_with_district_block_school_mapping(
 
     except Exception as e:
         logger.error(f"Error enhancing district-block-school mapping: {e}")
+        context.failed_sources.add(source)
+
+
+def _dependant_options_url(
+    auth_group: str, field: str, parent: str, locale: Optional[str] = None
+) -> str:
+    """URL of the endpoint serving one field's options; clients append `&value=`."""
+    params = {"field": field, "parent": parent}
+    if locale:
+        params["locale"] = locale
+    return f"/school/dependant-options/{auth_group}?{urlencode(params)}"
+
+
+def _enhance_with_lazy_school_options(
+    attributes: Dict[str, Any],
+    context: EnhancementContext,
+    auth_group: str,
+    include_blocks: bool,
+    locale: Optional[str] = None,
+):
+    """Enhance form with district options and on-demand block/school option URLs."""
+    source = school_source(authgroup_state_mapping[auth_group])
+    try:
+        districts = context.fetch(
+            source,
+            get_dependant_districts,
+            auth_group,
+        )
+
+        district_field = _find_field_by_key(attributes, "district")
+        if district_field:
+            district_field["options"] = _build_options(districts, locale)
+
+        school_parent = "district"
+        if include_blocks:
+            school_parent = "block_name"
+            block_field = _find_field_by_key(attributes, "block_name")
+            if block_field:
+                block_field["dependantOptionsUrl"] = _dependant_options_url(
+                    auth_group, "block_name", "district", locale
+                )
+
+        school_field = _find_field_by_key(attributes, "school_name")
+        if school_field:
+            school_field["dependantOptionsUrl"] = _dependant_options_url(
+                auth_group, "school_name", school_parent, locale
+            )
+
+        logger.info(f"Enhanced lazy school options with {len(districts)} districts")
+
+    except Exception as e:
+        logger.error(f"Error enhancing lazy school options: {e}")
+        context.failed_sources.add(source)
 
 
 def _enhance_with_tamil_nadu_district_options(
     attributes: Dict[str, Any],
+    context: EnhancementContext,
     auth_group: Optional[str] = None,
     state: Optional[str] = None,
+    locale: Optional[str] = None,
 ):
     """Enhance standalone district field with Tamil Nadu districts from school data."""
+    source = school_source(authgroup_state_mapping.get(auth_group, state))
     try:
-        districts_data = get_districts_by_filters(auth_group=auth_group, state=state)
+        districts_data = context.fetch(
+            source,
+            get_districts_by_filters,
+            auth_group=auth_group,
+            state=state,
+        )
         districts = districts_data.get("districts", [])
+        if not districts:
+            # The district lookup returns no districts when the schools can't be fetched
+            logger.error("Failed to get Tamil Nadu districts")
+            context.failed_sources.add(source)
+            return
 
         district_field = _find_field_by_key(attributes, "district")
         if district_field:
-            district_field["options"] = {
-                "en": [
-                    {"label": district, "value": district} for district in districts
-                ],
-                "hi": [
-                    {"label": district, "value": district} for district in districts
-                ],
-            }
+            district_field["options"] = _build_options(districts, locale)
 
         logger.info(
             f"Enhanced standalone Tamil Nadu district options with {len(districts)} districts"
@@ -262,52 +409,78 @@ def _enhance_with_tamil_nadu_district_options(
 
     except Exception as e:
         logger.error(f"Error enhancing Tamil Nadu district options: {e}")
+        context.failed_sources.add(source)
 
 
-def _enhance_with_colleges(attributes: Dict[str, Any]):
+def _enhance_with_colleges(
+    attributes: Dict[str, Any],
+    context: EnhancementContext,
+    locale: Optional[str] = None,
+):
     """Enhance form with college options using school service."""
     try:
-        colleges_data = get_colleges_list()
+        colleges_data = context.fetch(COLLEGES_SOURCE, get_colleges_list)
         if not colleges_data or "colleges" not in colleges_data:
             logger.error("Failed to get colleges data from school service")
+            context.failed_sources.add(COLLEGES_SOURCE)
             return
 
         colleges = colleges_data["colleges"]
 
         college_field = _find_field_by_key(attributes, "college_name")
         if college_field:
-            college_field["options"] = {
-                "en": [{"label": college, "value": college} for college in colleges],
-                "hi": [{"label": college, "value": college} for college in colleges],
-            }
+            college_field["options"] = _build_options(colleges, locale)
 
         logger.info(f"Enhanced college options with {len(colleges)} colleges")
 
     except Exception as e:
         logger.error(f"Error enhancing college options: {e}")
+        context.failed_sources.add(COLLEGES_SOURCE)
 
 
-def _enhance_with_states(attributes: Dict[str, Any]):
+def _enhance_with_states(
+    attributes: Dict[str, Any],
+    context: EnhancementContext,
+    locale: Optional[str] = None,
+):
     """Enhance form with state options using school service."""
     try:
-        states_data = get_states_list()
+        states_data = context.fetch(STATES_SOURCE, get_states_list)
         if not states_data or "states" not in states_data:
             logger.error("Failed to get states data from school service")
+            context.failed_sources.add(STATES_SOURCE)
             return
 
         states = states_data["states"]
 
         state_field = _find_field_by_key(attributes, "state")
         if state_field:
-            state_field["options"] = {
-                "en": [{"label": state, "value": state} for state in states],
-                "hi": [{"label": state, "value": state} for state in states],
-            }
+            state_field["options"] = _build_options(states, locale)
 
         logger.info(f"Enhanced state options with {len(states)} states")
 
     except Exception as e:
         logger.error(f"Error enhancing state options: {e}")
+        context.failed_sources.add(STATES_SOURCE)
+
+
+GUARDIAN_KEYS = [
+    "guardian_name",
+    "guardian_relation",
+    "guardian_phone",
+    "guardian_education_level",
+    "guardian_profession",
+]
+PARENT_KEYS = [
+    "father_name",
+    "father_phone",
+    "father_profession",
+    "father_education_level",
+    "mother_name",
+    "mother_phone",
+    "mother_profession",
+    "mother_education_level",
+]
 
 
 def is_user_attribute_empty(
@@ -331,37 +504,19 @@ def is_student_attribute_empty(
     """Check if student attribute is empty."""
 
     key = field["key"]
-    guardian_keys = [
-        "guardian_name",
-        "guardian_relation",
-        "guardian_phone",
-        "guardian_education_level",
-        "guardian_profession",
-    ]
-    parent_keys = [
-        "father_name",
-        "father_phone",
-        "father_profession",
-        "father_education_level",
-        "mother_name",
-        "mother_phone",
-        "mother_profession",
-        "mother_education_level",
-    ]
-
     if key == "primary_contact":
         return any(
             guardian_key not in student_data
             or student_data[guardian_key] == ""
             or student_data[guardian_key] is None
-            for guardian_key in guardian_keys
+            for guardian_key in GUARDIAN_KEYS
         ) and any(
             parent_key not in student_data
             or student_data[parent_key] == ""
             or student_data[parent_key] is None
-            for parent_key in parent_keys
+            for parent_key in PARENT_KEYS
         )
-    elif key in guardian_keys or key in parent_keys:
+    elif key in GUARDIAN_KEYS or key in PARENT_KEYS:
         return (
             key not in student_data
             or student_data[key] == ""
@@ -453,40 +608,6 @@ def school_name_in_returned_form_schema_data(
     return (returned_form_schema, number_of_fields_left)
 
 
-def is_field_already_in_schema(field: Dict[str, Any], schema: Dict[int, Any]) -> bool:
-    """Check if field is already in schema."""
-    return field["key"] in [value["key"] for value in list(schema.values())]
-
-
-def build_returned_form_schema_data(
-    returned_form_schema: Dict[int, Any],
-    field: Dict[str, Any],
-    number_of_fields_in_form_schema: int,
-) -> tuple:
-    """Build returned form schema data."""
-    if not is_field_already_in_schema(field, returned_form_schema):
-        returned_form_schema[number_of_fields_in_form_schema] = field
-        number_of_fields_in_form_schema += 1
-    return (returned_form_schema, number_of_fields_in_form_schema)
-
-
-def is_user_or_student_attribute_empty_then_build_schema(
-    form_schema: Dict[int, Any],
-    number_of_fields_in_form_schema: int,
-    field: Dict[str, Any],
-    data: Dict[str, Any],
-) -> tuple:
-    """Check if user or student attribute is empty then build schema."""
-    return (
-        build_returned_form_schema_data(
-            form_schema, field, number_of_fields_in_form_schema
-        )
-        if is_user_attribute_empty(field, data)
-        or is_student_attribute_empty(field, data)
-        else (form_schema, number_of_fields_in_form_schema)
-    )
-
-
 def find_dependant_parent(
     fields: Dict[str, Any],
     priority: int,
@@ -509,36 +630,83 @@ def find_dependant_parent(
     return dependent_hierarchy
 
 
-def find_children_fields(fields: Dict[str, Any], parent_field: Dict[str, Any]) -> list:
-    """Find children fields."""
-    children_fields = []
-    for field in fields:
-        if fields[field]["dependantField"] == parent_field["key"] or (
-            len(fields[field]["showBasedOn"]) > 0
-            and fields[field]["showBasedOn"].split("==")[0] == parent_field["key"]
-        ):
-            children_fields.append(int(field))
+class CompiledForm(NamedTuple):
+    """Immutable view of a form schema prepared for popup field selection."""
+
+    form: Dict[str, Any]
+    # Field priorities in ascending order
+    priorities: Tuple[int, ...]
+    # Priority -> field definition
+    fields: Mapping[int, Dict[str, Any]]
+    # Priority -> sorted priorities of the field and the fields depending on it
+    # through dependantField or showBasedOn
+    children: Mapping[int, Tuple[int, ...]]
+    # Field key -> priority
+    key_index: Mapping[str, int]
+
+
+def _parent_keys(field: Dict[str, Any]) -> list:
+    """Keys of the fields this field depends on."""
+    parent_keys = []
+    if field.get("dependantField"):
+        parent_keys.append(field["dependantField"])
+    show_based_on = field.get("showBasedOn") or ""
+    if len(show_based_on) > 0:
+        parent_keys.append(show_based_on.split("==")[0])
+    return parent_keys
+
+
+def compile_form_schema(form: Dict[str, Any]) -> CompiledForm:
+    """Compile a form schema's attributes into a parent -> children graph."""
+    fields = {int(priority): field for priority, field in form["attributes"].items()}
+
+    children_by_key: Dict[str, set] = {}
+    for priority, field in fields.items():
+        for parent_key in _parent_keys(field):
+            children_by_key.setdefault(parent_key, set()).add(priority)
+
+    children = {
+        priority: tuple(
+            sorted(children_by_key.get(field.get("key"), set()) | {priority})
+        )
+        for priority, field in fields.items()
+    }
+
+    return CompiledForm(
+        form=form,
+        priorities=tuple(sorted(fields)),
+        fields=MappingProxyType(fields),
+        children=MappingProxyType(children),
+        key_index=MappingProxyType(
+            {field.get("key"): priority for priority, field in fields.items()}
+        ),
+    )
 
-    return children_fields
 
+def get_compiled_form(form_id: str) -> Optional[CompiledForm]:
+    """Get the compiled form schema for a form ID, cached per container."""
+    return _compiled_form_cache.get_or_set(
+        str(form_id), lambda: _load_compiled_form(form_id)
+    )
 
-def get_student_fields_for_form(
-    form_id: str,
-    student_identifier: str,
-    number_of_fields_in_popup_form: int,
-    identifier_type: str = "student_id",
-) -> Dict[int, Any]:
-    """Get student fields for form"""
 
+def _load_compiled_form(form_id: str) -> Optional[CompiledForm]:
     form = get_form_schema_by_id(form_id)
-    if not form:
-        logger.error(f"Form not found with ID: {form_id}")
-        return {}
+    if not form or not form.get("attributes"):
+        return None
+    return compile_form_schema(form)
+
 
+async def _get_student_with_user(
+    student_identifier: str, identifier_type: str
+) -> Dict[str, Any]:
+    """Get the student record, attaching the user record when it is not nested."""
     if identifier_type == "user_id":
-        student_response = get_students(user_id=student_identifier)
+        student_response = await asyncio.to_thread(
+            get_students, user_id=student_identifier
+        )
     else:
-        student_response = get_student_by_id(student_identifier)
+        student_response = await get_student_by_id_concurrently(student_identifier)
     student_data = (
         student_response[0] if student_response and len(student_response) > 0 else {}
     )
@@ -549,7 +717,7 @@ def get_student_fields_for_form(
         user_lookup = None
         user_id = student_data.get("user_id")
         if user_id:
-            user_lookup = get_user_by_id(user_id)
+            user_lookup = await asyncio.to_thread(get_user_by_id, user_id)
 
         if user_lookup:
             if isinstance(user_lookup, list):
@@ -557,26 +725,202 @@ def get_student_fields_for_form(
             if isinstance(user_lookup, dict):
                 student_data["user"] = user_lookup
 
-    priority_order = sorted([eval(i) for i in form["attributes"].keys()])
-    fields = form["attributes"]
+    return student_data
+
+
+async def get_student_fields_for_form(
+    form_id: str,
+    student_identifier: str,
+    number_of_fields_in_popup_form: int,
+    identifier_type: str = "student_id",
+) -> Dict[int, Any]:
+    """Get student fields for form"""
+
+    # The form and the student/user chain are independent, so fetch them together
+    compiled_form, student_data = await asyncio.gather(
+        asyncio.to_thread(get_compiled_form, form_id),
+        _get_student_with_user(student_identifier, identifier_type),
+    )
+    if not compiled_form:
+        logger.error(f"Form not found with ID: {form_id}")
+        return {}
+
     total_number_of_fields = int(number_of_fields_in_popup_form)
-    number_of_fields_in_form_schema = 0
     returned_form_schema = {}
-
-    for priority in priority_order:
-        if number_of_fields_in_form_schema < total_number_of_fields:
-            children_fields = find_children_fields(fields, fields[str(priority)])
-            children_fields.append(priority)
-
-            for child_field in sorted(children_fields):
-                (
-                    returned_form_schema,
-                    number_of_fields_in_form_schema,
-                ) = is_user_or_student_attribute_empty_then_build_schema(
-                    returned_form_schema,
-                    number_of_fields_in_form_schema,
-                    fields[str(child_field)],
-                    student_data,
-                )
+    returned_keys = set()
+
+    # Walk priorities in order, offering each field together with its dependant
+    # children, until the popup has enough empty fields
+    for priority in compiled_form.priorities:
+        if len(returned_form_schema) >= total_number_of_fields:
+            break
+
+        for child_priority in compiled_form.children[priority]:
+            field = compiled_form.fields[child_priority]
+            if field["key"] in returned_keys:
+                continue
+            if is_user_attribute_empty(
+                field, student_data
+            ) or is_student_attribute_empty(field, student_data):
+                returned_form_schema[len(returned_form_schema)] = field
+                returned_keys.add(field["key"])
 
     return returned_form_schema
+
+
+def _empty_mask(values: list) -> int:
+    """Bitmask with bit i set when values[i] is None or an empty string."""
+    bits = "".join(
+        "1" if value is None or value == "" else "0" for value in reversed(values)
+    )
+    return int(bits or "0", 2)
+
+
+class _PageColumns:
+    """
+    Empty-value bitmasks of a page of students, one per student or user
+    attribute, each built once and shared by every field reading it.
+    """
+
+    def __init__(self, students: list):
+        self.students = students
+        self.users = [
+            (
+                student_data.get("user")
+                if isinstance(student_data.get("user"), dict)
+                else None
+            )
+            for student_data in students
+        ]
+        self._masks: Dict[Tuple[str, str], int] = {}
+
+    def student(self, key: str) -> int:
+        if ("student", key) not in self._masks:
+            self._masks[("student", key)] = _empty_mask(
+                [student_data.get(key) for student_data in self.students]
+            )
+        return self._masks[("student", key)]
+
+    def user(self, key: str) -> int:
+        if ("user", key) not in self._masks:
+            self._masks[("user", key)] = _empty_mask(
+                [user.get(key) if user else None for user in self.users]
+            )
+        return self._masks[("user", key)]
+
+
+def _missing_mask(field: Dict[str, Any], columns: _PageColumns) -> int:
+    """
+    Bitmask over a page of students with bit i set when student i lacks the
+    field, combined from attribute columns with the rules of
+    is_user_attribute_empty and is_student_attribute_empty.
+    """
+    key = field["key"]
+    mask = columns.user(key) if key in USER_QUERY_PARAMS else 0
+
+    if key == "primary_contact":
+        guardian_missing = parent_missing = 0
+        for guardian_key in GUARDIAN_KEYS:
+            guardian_missing |= columns.student(guardian_key)
+        for parent_key in PARENT_KEYS:
+            parent_missing |= columns.student(parent_key)
+        return mask | (guardian_missing & parent_missing)
+    if key in GUARDIAN_KEYS or key in PARENT_KEYS:
+        return mask | columns.student(key)
+    if key == "grade":
+        return mask | columns.student("grade_id")
+    if key in STUDENT_QUERY_PARAMS:
+        return mask | columns.student(key)
+    return mask
+
+
+def _transpose_masks(field_masks: list, student_count: int) -> list:
+    """Turn per-field student bitmasks into per-student field bitmasks."""
+    student_masks = [0] * student_count
+    for column, field_mask in enumerate(field_masks):
+        while field_mask:
+            lowest_bit = field_mask & -field_mask
+            student_masks[lowest_bit.bit_length() - 1] |= 1 << column
+            field_mask ^= lowest_bit
+    return student_masks
+
+
+def get_profile_completeness_for_group(
+    form_id: str,
+    batch_id: Optional[str] = None,
+    group_id: Optional[str] = None,
+    group_type: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Evaluate which form fields are missing for every student of a batch/group.
+
+    Members are loaded page by page. Each student/user attribute of a page is
+    read once into a bitmask of students where it is empty, and each field's
+    mask of students missing it is combined from those with bit operations. Per-student masks (bit j set
+    when fields[j] is missing, hex encoded) and per-field counts are returned.
+    """
+    compiled_form = get_compiled_form(form_id)
+    if not compiled_form:
+        raise HTTPException(status_code=404, detail="Form schema does not exist!")
+
+    if batch_id:
+        batch_data = get_batch_by_id(batch_id)
+        if not batch_data or "id" not in batch_data:
+            raise HTTPException(status_code=404, detail="Batch not found")
+        group_id, group_type = batch_data["id"], "batch"
+    if not group_id:
+        raise HTTPException(status_code=400, detail="batch_id or group_id is required")
+    if not group_type:
+        raise HTTPException(
+            status_code=400, detail="group_type is required with group_id"
+        )
+
+    fields = []
+    field_keys = set()
+    for priority in compiled_form.priorities:
+        field = compiled_form.fields[priority]
+        if field["key"] not in field_keys:
+            fields.append(field)
+            field_keys.add(field["key"])
+
+    logger.info(
+        f"Evaluating profile completeness of form {form_id} for group {group_id} ({group_type})"
+    )
+
+    field_masks = [0] * len(fields)
+    members = []
+    for page in iter_student_pages(group_id=group_id, group_type=group_type):
+        base = len(members)
+        columns = _PageColumns(page)
+        for column, field in enumerate(fields):
+            field_masks[column] |= _missing_mask(field, columns) << base
+        for student_data in page:
+            user_data = student_data.get("user")
+            members.append(
+                {
+                    "student_id": student_data.get("student_id"),
+                    "user_id": student_data.get("user_id")
+                    or (user_data.get("id") if isinstance(user_data, dict) else None),
+                }
+            )
+
+    student_masks = _transpose_masks(field_masks, len(members))
+    students = [
+        {**member, "missing_mask": format(mask, "x")}
+        for member, mask in zip(members, student_masks)
+    ]
+
+    logger.info(f"Evaluated profile completeness for {len(members)} students")
+    return {
+        "form_id": form_id,
+        "group_id": group_id,
+        "group_type": group_type,
+        "fields": [field["key"] for field in fields],
+        "total_students": len(members),
+        "incomplete_students": sum(1 for mask in student_masks if mask),
+        "missing_counts": {
+            field["key"]: field_mask.bit_count()
+            for field, field_mask in zip(fields, field_masks)
+        },
+        "students": students,
+    }
@@ -2,16 +2,20 @@
 
 import requests
 from typing import Dict, Any, Optional
+from cache import TTLCache
 from logger_config import get_logger
 from routes import grade_db_url
 from helpers import db_request_token, is_response_valid, safe_get_first_item
+from settings import settings
 
 logger = get_logger()
 
+_grade_cache = TTLCache(ttl_seconds=settings.REFERENCE_DATA_TTL_SECONDS)
+
 
 def get_grade_by_number(number: int) -> Optional[Dict[str, Any]]:
-    """Get grade by number."""
-    return get_grade(number=number)
+    """Get grade by number, cached as grades rarely change."""
+    return _grade_cache.get_or_set(number, lambda: get_grade(number=number))
 
 
 def get_grade_by_id(grade_id: str) -> Optional[Dict[str, Any]]:
@@ -2,19 +2,26 @@
 
 import requests
 from typing import Dict, Any, Optional
+from cache import TTLCache
 from logger_config import get_logger
 from routes import group_db_url
 from helpers import db_request_token, is_response_valid, safe_get_first_item
 from mapping import GROUP_QUERY_PARAMS
+from settings import settings
 
 logger = get_logger()
 
+_group_cache = TTLCache(ttl_seconds=settings.REFERENCE_DATA_TTL_SECONDS)
+
 
 def get_group_by_child_id_and_type(
     child_id: str, group_type: str
 ) -> Optional[Dict[str, Any]]:
-    """Get group by child_id and type."""
-    return get_group(child_id=child_id, type=group_type)
+    """Get group by child_id and type, cached as these groups rarely change."""
+    return _group_cache.get_or_set(
+        (str(child_id), group_type),
+        lambda: get_group(child_id=child_id, type=group_type),
+    )
 
 
 def get_group_by_id(group_id: str) -> Optional[Dict[str, Any]]:
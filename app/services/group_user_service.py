@@ -1,5 +1,6 @@
 """Group User service for business logic without HTTP dependencies."""
 
+import asyncio
 import requests
 from typing import Dict, Any, Optional
 from datetime import datetime
@@ -12,7 +13,7 @@ from services.auth_group_service import get_auth_group_by_name
 from services.batch_service import get_batch_by_id
 from services.group_service import get_group_by_child_id_and_type
 from mapping import authgroup_state_mapping
-from services.school_service import get_school
+from services.school_directory_service import resolve_school
 
 logger = get_logger()
 
@@ -32,7 +33,9 @@ async def create_group_user(
 
     logger.info(f"Creating group user record: {data}")
 
-    response = requests.post(group_user_db_url, data=data, headers=db_request_token())
+    response = await asyncio.to_thread(
+        requests.post, group_user_db_url, data=data, headers=db_request_token()
+    )
 
     if is_response_valid(response, "Group User API could not create the record!"):
         result = response.json()
@@ -63,12 +66,14 @@ def get_group_user(**params) -> Optional[Dict[str, Any]]:
 
 async def create_auth_group_user_record(data, auth_group_name):
     """Create auth group user record"""
-    auth_group_data = get_auth_group_by_name(auth_group_name)
+    auth_group_data = await asyncio.to_thread(get_auth_group_by_name, auth_group_name)
     if not auth_group_data or "id" not in auth_group_data:
         raise HTTPException(status_code=404, detail="Auth group not found")
 
-    group_data = get_group_by_child_id_and_type(
-        child_id=auth_group_data["id"], group_type="auth_group"
+    group_data = await asyncio.to_thread(
+        get_group_by_child_id_and_type,
+        child_id=auth_group_data["id"],
+        group_type="auth_group",
     )
     if not group_data or not isinstance(group_data, dict) or "id" not in group_data:
         raise HTTPException(status_code=404, detail="Auth group group not found")
@@ -86,12 +91,12 @@ async def create_auth_group_user_record(data, auth_group_name):
 
 async def create_batch_user_record(data, batch_id):
     """Create batch user record"""
-    batch_data = get_batch_by_id(batch_id)
+    batch_data = await asyncio.to_thread(get_batch_by_id, batch_id)
     if not batch_data or "id" not in batch_data:
         raise HTTPException(status_code=404, detail="Batch not found")
 
-    group_data = get_group_by_child_id_and_type(
-        child_id=batch_data["id"], group_type="batch"
+    group_data = await asyncio.to_thread(
+        get_group_by_child_id_and_type, child_id=batch_data["id"], group_type="batch"
     )
     if not group_data or not isinstance(group_data, dict) or "id" not in group_data:
         raise HTTPException(status_code=404, detail="Batch group not found")
@@ -115,20 +120,16 @@ async def create_school_user_record(
         authgroup_state_mapping.get(auth_group_name, "") if auth_group_name else None
     )
 
-    # Use the flexible get_school function to handle all parameters including block_name
-    school_params = {"name": str(school_name), "district": str(district)}
-    if state:
-        school_params["state"] = state
-    if block_name:
-        school_params["block_name"] = str(block_name)
-
-    school_data = get_school(**school_params)
+    # Resolve from the state's school directory, tolerating spelling variants
+    school_data, _ = await asyncio.to_thread(
+        resolve_school, school_name, district, state, block_name
+    )
 
     if not school_data or "id" not in school_data:
         raise HTTPException(status_code=404, detail="School not found")
 
-    group_data = get_group_by_child_id_and_type(
-        child_id=school_data["id"], group_type="school"
+    group_data = await asyncio.to_thread(
+        get_group_by_child_id_and_type, child_id=school_data["id"], group_type="school"
     )
     if not group_data or not isinstance(group_data, dict) or "id" not in group_data:
         raise HTTPException(status_code=404, detail="School group not found")
@@ -150,7 +151,9 @@ async def create_grade_user_record(data):
     if not grade_id:
         raise HTTPException(status_code=400, detail="Grade ID is required")
 
-    group_data = get_group_by_child_id_and_type(child_id=grade_id, group_type="grade")
+    group_data = await asyncio.to_thread(
+        get_group_by_child_id_and_type, child_id=grade_id, group_type="grade"
+    )
     if not group_data or not isinstance(group_data, dict) or "id" not in group_data:
         raise HTTPException(status_code=404, detail="Grade group not found")
 
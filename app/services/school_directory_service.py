@@ -0,0 +1,569 @@
+"""School directory service for in-memory school lookups."""
+
+import bisect
+import gzip
+import hashlib
+import json
+import re
+from difflib import SequenceMatcher
+from typing import Dict, Any, Iterator, List, NamedTuple, Optional
+from cache import TTLCache
+from fastapi import HTTPException
+from logger_config import get_logger
+from settings import settings
+from helpers import decode_keyset_cursor, encode_keyset_cursor, localize
+from mapping import authgroup_state_mapping
+from services.school_service import (
+    SCHOOL_PAGE_MAX_LIMIT,
+    build_school_hierarchy,
+    build_school_location_params,
+    get_school,
+    get_schools_by_location,
+    get_sorted_dropdown_schools,
+    school_sort_key,
+    to_dropdown_school,
+)
+from services.school_snapshot_service import (
+    SNAPSHOT_COLUMNS,
+    query_snapshot_school_page,
+)
+
+logger = get_logger()
+
+# Only exact and token-set matches of the normalized name are accepted; names
+# that are merely similar (e.g. "Sector 13" for "Sector 12") are suggestions.
+SUGGESTION_THRESHOLD = 0.6
+MAX_SUGGESTIONS = 5
+
+# Page size used when streaming every school of a listing as NDJSON
+SCHOOL_EXPORT_PAGE_SIZE = 500
+
+# Directory versions are stored as gzipped JSON record sets under this prefix
+VERSION_KEY_PREFIX = "school-directory"
+VERSION_TOKEN_PATTERN = re.compile(r"[0-9a-f]{16}")
+
+# Child field -> parent fields it can be looked up by in lazy dependant options
+DEPENDANT_OPTION_PARENTS = {
+    "block_name": ["district"],
+    "school_name": ["district", "block_name"],
+}
+HIERARCHY_KEYS = {
+    ("district", "block_name"): "district_blocks",
+    ("district", "school_name"): "district_schools",
+    ("block_name", "school_name"): "block_schools",
+}
+
+_directory_cache = TTLCache(ttl_seconds=settings.SCHOOL_DIRECTORY_TTL_SECONDS)
+
+# Record sets of every directory version, stored in S3 so a version token
+# handed out by any container can be diffed against by every other one.
+# Without a bucket (local development) versions are kept in memory.
+_stored_versions = set()
+_version_records = TTLCache(
+    ttl_seconds=settings.SCHOOL_DIRECTORY_TTL_SECONDS, max_entries=50
+)
+_local_versions: Dict[tuple, List[Dict[str, Any]]] = {}
+_s3_client = None
+
+
+class SchoolMatch(NamedTuple):
+    school: Optional[Dict[str, Any]]
+    suggestions: List[str]
+
+
+class DirectoryMatch(NamedTuple):
+    school: Optional[Dict[str, Any]]
+    suggestions: List[str]
+    # Several schools share the typed name, so no lookup can pick one
+    ambiguous: bool = False
+
+
+def normalize_school_text(value: Any) -> str:
+    """Casefold, drop punctuation and collapse whitespace for comparisons."""
+    if value is None:
+        return ""
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", str(value).casefold()).split())
+
+
+def _token_key(normalized: str) -> tuple:
+    return tuple(sorted(set(normalized.split())))
+
+
+class SchoolDirectory:
+    """Normalized indexes over every school of one state."""
+
+    def __init__(self, state: str, schools: List[Dict[str, Any]]):
+        self.state = state
+        self.schools = schools
+        self._by_district: Dict[str, List[Dict[str, Any]]] = {}
+        self._normalized_names: Dict[int, str] = {}
+        self._hierarchies: Dict[str, Dict[str, Dict[str, List[str]]]] = {}
+        self._listings: Dict[tuple, List[Dict[str, Any]]] = {}
+
+        # Records projected to the snapshot columns; the version is a content
+        # hash, so every container derives the same token for the same data
+        self.records: Dict[Any, Dict[str, Any]] = {
+            school.get("id"): {
+                column: school.get(column) for column in SNAPSHOT_COLUMNS
+            }
+            for school in schools
+        }
+        self.version = hashlib.sha256(
+            json.dumps(
+                sorted(self.records.values(), key=lambda record: str(record["id"])),
+                sort_keys=True,
+                default=str,
+            ).encode()
+        ).hexdigest()[:16]
+
+        for school in schools:
+            if not school.get("name"):
+                continue
+            district_key = normalize_school_text(school.get("district"))
+            self._by_district.setdefault(district_key, []).append(school)
+            self._normalized_names[id(school)] = normalize_school_text(
+                school.get("name")
+            )
+
+    def resolve(
+        self, name: str, district: str, block_name: Optional[str] = None
+    ) -> DirectoryMatch:
+        """
+        Resolve a typed school name to the canonical school of a district.
+
+        A school is returned only when it is the one school of the district
+        (and block, if given) whose normalized name equals the typed one, or
+        has the same set of words. Similar names, schools outside the given
+        block and schools sharing a name are returned as suggestions, never
+        as a match.
+        """
+        candidates = self._by_district.get(normalize_school_text(district), [])
+        name_key = normalize_school_text(name)
+        if block_name:
+            block_key = normalize_school_text(block_name)
+            in_block = [
+                school
+                for school in candidates
+                if normalize_school_text(school.get("block_name")) == block_key
+            ]
+            if not in_block:
+                return DirectoryMatch(None, self._suggestions(name_key, candidates))
+            candidates = in_block
+
+        if not candidates:
+            return DirectoryMatch(None, [])
+
+        exact = [s for s in candidates if self._normalized_names[id(s)] == name_key]
+        if len(exact) == 1:
+            return DirectoryMatch(exact[0], [])
+        if exact:
+            return DirectoryMatch(None, _school_labels(exact), ambiguous=True)
+
+        tokens = _token_key(name_key)
+        token_matches = [
+            s for s in candidates if _token_key(self._normalized_names[id(s)]) == tokens
+        ]
+        if len(token_matches) == 1:
+            return DirectoryMatch(token_matches[0], [])
+
+        return DirectoryMatch(None, self._suggestions(name_key, candidates))
+
+    def _suggestions(
+        self, name_key: str, candidates: List[Dict[str, Any]]
+    ) -> List[str]:
+        """Names of the candidates most similar to a normalized name."""
+        scored = sorted(
+            (
+                (
+                    SequenceMatcher(
+                        None, name_key, self._normalized_names[id(s)]
+                    ).ratio(),
+                    s,
+                )
+                for s in candidates
+            ),
+            key=lambda item: item[0],
+            reverse=True,
+        )
+        suggestions = []
+        for score, school in scored:
+            if score < SUGGESTION_THRESHOLD or len(suggestions) >= MAX_SUGGESTIONS:
+                break
+            if school["name"] not in suggestions:
+                suggestions.append(school["name"])
+        return suggestions
+
+    def listing(
+        self, district: Optional[str] = None, block_name: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Dropdown records of the named schools in a district and block, in
+        (name, id) order. Sorted once per directory, so pages are sliced
+        without sorting again.
+        """
+        key = (district, block_name)
+        listing = self._listings.get(key)
+        if listing is None:
+            everything = self._listings.get((None, None))
+            if everything is None:
+                everything = sorted(
+                    (
+                        to_dropdown_school(school)
+                        for school in self.schools
+                        if school.get("name")
+                    ),
+                    key=school_sort_key,
+                )
+                self._listings[(None, None)] = everything
+            listing = [
+                school
+                for school in everything
+                if (district is None or school["district"] == district)
+                and (block_name is None or school["block_name"] == block_name)
+            ]
+            self._listings[key] = listing
+        return listing
+
+    def hierarchy(self, auth_group: str) -> Dict[str, Dict[str, List[str]]]:
+        """District/block/school option lists for an auth group, built once."""
+        hierarchy = self._hierarchies.get(auth_group)
+        if hierarchy is None:
+            hierarchy = build_school_hierarchy(auth_group, self.schools)
+            self._hierarchies[auth_group] = hierarchy
+        return hierarchy
+
+
+def _school_labels(schools: List[Dict[str, Any]]) -> List[str]:
+    """Tell apart schools sharing a name by their block."""
+    return [
+        (
+            f"{school['name']} ({school['block_name']})"
+            if school.get("block_name")
+            else school["name"]
+        )
+        for school in schools[:MAX_SUGGESTIONS]
+    ]
+
+
+def get_school_directory(state: str) -> Optional[SchoolDirectory]:
+    """Get the cached directory for a state, loading it on a miss."""
+    directory = _directory_cache.get(state)
+    if directory is not None:
+        return directory
+
+    logger.info(f"Loading school directory for state: {state}")
+    try:
+        schools_data = get_schools_by_location({"state": state})
+    except HTTPException:
+        schools_data = None
+    if schools_data is None:
+        return None
+
+    directory = SchoolDirectory(state, schools_data)
+    _directory_cache.set(state, directory)
+    logger.info(f"Indexed {len(schools_data)} schools for state: {state}")
+    return directory
+
+
+def _page_after(
+    schools: List[Dict[str, Any]], after: Optional[tuple], limit: int
+) -> List[Dict[str, Any]]:
+    start = (
+        0 if after is None else bisect.bisect_right(schools, after, key=school_sort_key)
+    )
+    return schools[start : start + limit]
+
+
+def _get_school_page_rows(
+    query_params: Dict[str, Any], after: Optional[tuple], limit: int
+) -> List[Dict[str, Any]]:
+    """
+    Up to `limit` dropdown schools after the (name, id) `after`, from the
+    bundled snapshot, else the state's cached directory, and only when
+    neither is available from a full DB listing.
+    """
+    rows = query_snapshot_school_page(query_params, after, limit)
+    if rows is not None:
+        return [to_dropdown_school(row) for row in rows]
+
+    state = query_params.get("state")
+    directory = get_school_directory(state) if state else None
+    if directory is not None:
+        listing = directory.listing(
+            query_params.get("district"), query_params.get("block_name")
+        )
+        return _page_after(listing, after, limit)
+
+    logger.info(f"Paging schools from a full DB listing for params: {query_params}")
+    return _page_after(get_sorted_dropdown_schools(query_params) or [], after, limit)
+
+
+def get_school_page(
+    auth_group: Optional[str] = None,
+    state: Optional[str] = None,
+    district: Optional[str] = None,
+    block: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Get one page of the dropdown school listing, in the same (name, id) order
+    as the full listing, along with a `next_cursor` holding the (name, id) of
+    its last school, so pages neither skip nor repeat schools when schools are
+    added or removed in between.
+    """
+    query_params = build_school_location_params(auth_group, state, district, block)
+    limit = limit or SCHOOL_PAGE_MAX_LIMIT
+    position = decode_keyset_cursor(cursor, ["name", "id"])
+    after = None
+    if position is not None:
+        if not isinstance(position["name"], str) or not isinstance(position["id"], int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        after = (position["name"], position["id"])
+
+    logger.info(f"Fetching school page with params: {query_params}, after: {after}")
+    # One extra row tells whether another page follows
+    rows = _get_school_page_rows(query_params, after, limit + 1)
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_keyset_cursor(
+            {"name": page[-1]["name"], "id": page[-1]["id"]}
+        )
+    return {"schools": page, "next_cursor": next_cursor}
+
+
+def iter_schools_by_filters(
+    auth_group: Optional[str] = None,
+    state: Optional[str] = None,
+    district: Optional[str] = None,
+    block: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield every dropdown school of a listing, one page at a time."""
+    query_params = build_school_location_params(auth_group, state, district, block)
+    after = None
+    while True:
+        page = _get_school_page_rows(query_params, after, SCHOOL_EXPORT_PAGE_SIZE)
+        yield from page
+        if len(page) < SCHOOL_EXPORT_PAGE_SIZE:
+            return
+        after = school_sort_key(page[-1])
+
+
+def _get_s3_client():
+    global _s3_client
+    if _s3_client is None:
+        # Only needed when a versions bucket is configured
+        import boto3
+
+        _s3_client = boto3.client("s3")
+    return _s3_client
+
+
+def _version_key(state: str, version: str) -> str:
+    return f"{VERSION_KEY_PREFIX}/{state}/{version}.json.gz"
+
+
+def _save_directory_version(directory: SchoolDirectory):
+    """Store a directory's records under its version, once per version."""
+    version_id = (directory.state, directory.version)
+    if version_id in _stored_versions or not directory.records:
+        return
+
+    records = list(directory.records.values())
+    bucket = settings.SCHOOL_DIRECTORY_VERSIONS_BUCKET
+    if not bucket:
+        _local_versions[version_id] = records
+        _stored_versions.add(version_id)
+        return
+
+    key = _version_key(*version_id)
+    s3 = _get_s3_client()
+    try:
+        try:
+            s3.head_object(Bucket=bucket, Key=key)
+        except s3.exceptions.ClientError as e:
+            if e.response["Error"]["Code"] not in ("404", "NoSuchKey"):
+                raise
+            s3.put_object(
+                Bucket=bucket,
+                Key=key,
+                Body=gzip.compress(json.dumps(records, default=str).encode()),
+                ContentType="application/json",
+                ContentEncoding="gzip",
+            )
+            logger.info(f"Stored school directory version {key}")
+        _stored_versions.add(version_id)
+    except Exception as e:
+        logger.error(f"Could not store school directory version {key}: {e}")
+
+
+def _load_directory_version(
+    state: str, version: str
+) -> Optional[Dict[Any, Dict[str, Any]]]:
+    """Get the records of a stored directory version, or None if it's unknown."""
+    version_id = (state, version)
+    records = _version_records.get(version_id)
+    if records is not None:
+        return records
+
+    bucket = settings.SCHOOL_DIRECTORY_VERSIONS_BUCKET
+    if not bucket:
+        stored = _local_versions.get(version_id)
+    else:
+        s3 = _get_s3_client()
+        try:
+            response = s3.get_object(Bucket=bucket, Key=_version_key(state, version))
+            stored = json.loads(gzip.decompress(response["Body"].read()))
+        except s3.exceptions.NoSuchKey:
+            stored = None
+        except Exception as e:
+            logger.error(f"Could not load school directory version {version}: {e}")
+            stored = None
+    if stored is None:
+        return None
+
+    records = {record["id"]: record for record in stored}
+    _version_records.set(version_id, records)
+    return records
+
+
+def get_school_changes_since(state: str, since: Optional[str]) -> Dict[str, Any]:
+    """
+    Get schools added, changed or removed in a state since a version token.
+
+    The changes are diffed against the stored records of the `since` version.
+    When that version is unknown (never stored, or expired from the bucket)
+    the full list is returned with `full_resync` set so the client replaces
+    its copy.
+    """
+    directory = get_school_directory(state)
+    if directory is None:
+        raise HTTPException(status_code=500, detail="Could not fetch schools!")
+    # Version tokens are only handed out here, so only this path stores them
+    _save_directory_version(directory)
+
+    response = {
+        "state": state,
+        "since": since,
+        "version": directory.version,
+        "full_resync": False,
+        "changed": [],
+        "removed": [],
+    }
+    if since == directory.version:
+        return response
+
+    previous = None
+    if since and VERSION_TOKEN_PATTERN.fullmatch(since):
+        previous = _load_directory_version(state, since)
+    if previous is None:
+        response["full_resync"] = True
+        response["changed"] = list(directory.records.values())
+        return response
+
+    response["changed"] = [
+        record
+        for school_id, record in directory.records.items()
+        if previous.get(school_id) != record
+    ]
+    response["removed"] = sorted(
+        (school_id for school_id in previous if school_id not in directory.records),
+        key=str,
+    )
+    return response
+
+
+def _get_auth_group_hierarchy(auth_group: str) -> Dict[str, Dict[str, List[str]]]:
+    if auth_group not in authgroup_state_mapping:
+        raise HTTPException(status_code=400, detail="Invalid auth group")
+
+    directory = get_school_directory(authgroup_state_mapping[auth_group])
+    if directory is None:
+        raise HTTPException(status_code=500, detail="Could not fetch schools!")
+    return directory.hierarchy(auth_group)
+
+
+def get_dependant_districts(auth_group: str) -> List[str]:
+    """Get the top-level district options of an auth group's school hierarchy."""
+    return sorted(_get_auth_group_hierarchy(auth_group)["district_schools"])
+
+
+def get_dependant_options(
+    auth_group: str,
+    field: str,
+    parent: str,
+    value: str,
+    locale: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Get the options of one dependant field for a single parent value, e.g. the
+    schools of one district. Lets lazy form schemas skip the full mapping.
+    """
+    if parent not in DEPENDANT_OPTION_PARENTS.get(field, []):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Options for '{field}' cannot be looked up by '{parent}'",
+        )
+
+    hierarchy = _get_auth_group_hierarchy(auth_group)
+    options = hierarchy[HIERARCHY_KEYS[(parent, field)]].get(value, [])
+    return {
+        "auth_group": auth_group,
+        "field": field,
+        "parent": parent,
+        "value": value,
+        "options": localize(options, locale),
+    }
+
+
+def resolve_school(
+    name: str, district: str, state: Optional[str], block_name: Optional[str] = None
+) -> SchoolMatch:
+    """
+    Resolve a school from registration input, tolerating whitespace, case and
+    word order. Schools sharing the typed name are never picked between; the
+    user gets them as suggestions. When the directory has no match (or no
+    state is known) the exact DB lookup is used, so schools added since the
+    directory was loaded are still found; the directory's suggestions are
+    returned if that misses.
+    """
+    suggestions = []
+    if state:
+        directory = get_school_directory(state)
+        if directory is not None:
+            match = directory.resolve(name, district, block_name)
+            if match.ambiguous:
+                # The exact DB lookup would just take the first of them
+                return SchoolMatch(None, match.suggestions)
+            if match.school:
+                if match.school.get("name") != name:
+                    logger.info(
+                        f"Resolved school '{name}' to canonical '{match.school.get('name')}'"
+                    )
+                return SchoolMatch(match.school, [])
+            suggestions = match.suggestions
+
+    school_params = {"name": str(name), "district": str(district)}
+    if state:
+        school_params["state"] = state
+    if block_name:
+        school_params["block_name"] = str(block_name)
+
+    try:
+        school = get_school(**school_params)
+    except HTTPException as e:
+        if e.status_code != 404:
+            raise
+        school = None
+    return SchoolMatch(school, [] if school else suggestions)
+
+
+def school_not_found_detail(
+    school_name: str, district: str, suggestions: List[str]
+) -> str:
+    """Build the error message for an unresolved school, with suggestions."""
+    detail = f"School '{school_name}' not found in district '{district}'"
+    if suggestions:
+        detail += f". Did you mean: {', '.join(suggestions)}?"
+    return detail
@@ -1,7 +1,9 @@
 """School service for business logic without HTTP dependencies."""
 
+import asyncio
 import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional
+from cache import TTLCache
 from logger_config import get_logger
 from routes import school_db_url
 from helpers import (
@@ -9,12 +11,24 @@ from helpers import (
     is_response_valid,
     safe_get_first_item,
     is_response_empty,
+    localize,
 )
 from mapping import SCHOOL_QUERY_PARAMS, USER_QUERY_PARAMS, authgroup_state_mapping
 from services.school_mapping_constants import GUJARAT_DISTRICT_SCHOOL_MAPPING
+from services.school_snapshot_service import query_snapshot_schools
+from settings import settings
 
 logger = get_logger()
 
+# Hard maximum page size for paginated school listings
+SCHOOL_PAGE_MAX_LIMIT = 1000
+
+# Resolved (school record, matched via udise_code) keyed by the looked-up code,
+# for login verification
+_school_code_cache = TTLCache(
+    ttl_seconds=settings.SCHOOL_DIRECTORY_TTL_SECONDS, max_entries=5000
+)
+
 # Canonical Tamil Nadu district list for the TN Govt Hiring Form.
 # This is intentionally Tamil Nadu specific and removes duplicate DB spelling variants.
 TAMIL_NADU_SCHOOL_DISTRICTS = [
@@ -184,47 +198,62 @@ def get_states_list() -> Dict[str, Any]:
     return {"states": states}
 
 
-async def verify_school_comprehensive(
-    code: str, query_params: Dict[str, Any]
-) -> Dict[str, Any]:
-    """Comprehensive school verification returning canonical identifiers."""
-    logger.info(f"Verifying school with code: {code} and params: {query_params}")
-    invalid_response = {"is_valid": False}
-
-    # Try school code first
-    school_record = None
-    found_via_udise_code = False
-
+def _fetch_school_by_identifier(
+    identifier_type: str, code: str
+) -> Optional[Dict[str, Any]]:
+    """Fetch a single school by code or udise_code, returning None on a miss."""
     response = requests.get(
         school_db_url,
-        params={"code": code},
+        params={identifier_type: code},
         headers=db_request_token(),
     )
 
     if is_response_valid(response):
         data = is_response_empty(response.json(), False)
         if data:
-            school_record = (
-                safe_get_first_item(data) if isinstance(data, list) else data
-            )
+            return safe_get_first_item(data) if isinstance(data, list) else data
+    return None
 
-    # If no school found with school code, try udise_code
-    if not school_record:
-        logger.info(f"No school found with code, trying udise_code for: {code}")
 
-        response = requests.get(
-            school_db_url,
-            params={"udise_code": code},
-            headers=db_request_token(),
-        )
+async def find_school_by_code_or_udise_code(code: str) -> tuple:
+    """
+    Find a school whose code or udise_code matches, preferring code.
 
-        if is_response_valid(response):
-            data = is_response_empty(response.json(), False)
-            if data:
-                school_record = (
-                    safe_get_first_item(data) if isinstance(data, list) else data
-                )
-                found_via_udise_code = True
+    The resolved answer is cached per looked-up code, so a cached udise_code
+    match can't outlive the code match that takes precedence over it. On a
+    miss both lookups run in parallel so verification costs at most one DB
+    round trip. Returns the school record (or None) and whether it matched via
+    udise_code.
+    """
+    resolved = _school_code_cache.get(code)
+    if resolved:
+        return resolved
+
+    by_code, by_udise_code = await asyncio.gather(
+        asyncio.to_thread(_fetch_school_by_identifier, "code", code),
+        asyncio.to_thread(_fetch_school_by_identifier, "udise_code", code),
+    )
+
+    if by_code:
+        resolved = (by_code, False)
+    elif by_udise_code:
+        logger.info(f"No school found with code, matched udise_code for: {code}")
+        resolved = (by_udise_code, True)
+    else:
+        return None, False
+
+    _school_code_cache.set(code, resolved)
+    return resolved
+
+
+async def verify_school_comprehensive(
+    code: str, query_params: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Comprehensive school verification returning canonical identifiers."""
+    logger.info(f"Verifying school with code: {code} and params: {query_params}")
+    invalid_response = {"is_valid": False}
+
+    school_record, found_via_udise_code = await find_school_by_code_or_udise_code(code)
 
     if not school_record:
         logger.warning(f"No school found for code: {code}")
@@ -272,6 +301,33 @@ async def verify_school_comprehensive(
     return {"is_valid": True, **identifiers}
 
 
+def get_schools_by_location(
+    query_params: Dict[str, Any], error_message: str = "Could not fetch schools!"
+) -> Optional[list]:
+    """
+    Get all schools matching state/district/block_name filters.
+    Served from the bundled school snapshot when it is fresh, else the DB service.
+    """
+    schools_data = query_snapshot_schools(**query_params)
+    if schools_data is not None:
+        logger.info(
+            f"Serving {len(schools_data)} schools from snapshot for params: {query_params}"
+        )
+        return schools_data
+
+    response = requests.get(
+        school_db_url, params=query_params, headers=db_request_token()
+    )
+
+    if is_response_valid(response, error_message):
+        schools_data = response.json()
+        if not isinstance(schools_data, list):
+            schools_data = [schools_data]
+        return schools_data
+
+    return None
+
+
 def get_districts_by_filters(
     auth_group: Optional[str] = None, state: Optional[str] = None
 ) -> Dict[str, Any]:
@@ -292,14 +348,8 @@ def get_districts_by_filters(
 
     logger.info(f"Fetching districts with params: {query_params}")
 
-    response = requests.get(
-        school_db_url, params=query_params, headers=db_request_token()
-    )
-
-    if is_response_valid(response, "Could not fetch districts!"):
-        schools_data = response.json()
-        if not isinstance(schools_data, list):
-            schools_data = [schools_data]
+    schools_data = get_schools_by_location(query_params, "Could not fetch districts!")
+    if schools_data is not None:
 
         districts = []
         chhattisgarh_districts = "Bastar+DANTEWADA+Dhamtari+Durg+Gariaband+Janjgir - Champa+Jashpur+Raigarh+Raipur+Rajnandgaon".split(
@@ -355,14 +405,8 @@ def get_blocks_by_filters(
 
     logger.info(f"Fetching blocks with params: {query_params}")
 
-    response = requests.get(
-        school_db_url, params=query_params, headers=db_request_token()
-    )
-
-    if is_response_valid(response, "Could not fetch blocks!"):
-        schools_data = response.json()
-        if not isinstance(schools_data, list):
-            schools_data = [schools_data]
+    schools_data = get_schools_by_location(query_params, "Could not fetch blocks!")
+    if schools_data is not None:
 
         # Extract unique blocks (block_name field)
         blocks = list(
@@ -380,13 +424,13 @@ def get_blocks_by_filters(
     return {"blocks": []}
 
 
-def get_schools_for_dropdown_by_filters(
+def build_school_location_params(
     auth_group: Optional[str] = None,
     state: Optional[str] = None,
     district: Optional[str] = None,
     block: Optional[str] = None,
 ) -> Dict[str, Any]:
-    """Get list of schools for dropdown, filtered by location hierarchy."""
+    """Build school query params from the location hierarchy filters."""
     query_params = {}
 
     # If auth_group provided, map to state
@@ -401,47 +445,68 @@ def get_schools_for_dropdown_by_filters(
     if block:
         query_params["block_name"] = block
 
-    logger.info(f"Fetching schools for dropdown with params: {query_params}")
+    return query_params
 
-    response = requests.get(
-        school_db_url, params=query_params, headers=db_request_token()
-    )
 
-    if is_response_valid(response, "Could not fetch schools!"):
-        schools_data = response.json()
-        if not isinstance(schools_data, list):
-            schools_data = [schools_data]
+def to_dropdown_school(school: Dict[str, Any]) -> Dict[str, Any]:
+    """Return simplified school data for dropdown."""
+    return {
+        "id": school.get("id"),
+        "name": school.get("name"),
+        "code": school.get("code"),
+        "district": school.get("district"),
+        "block_name": school.get("block_name"),
+    }
+
+
+def school_sort_key(school: Dict[str, Any]) -> tuple:
+    """Listing order of schools: by name, then id to break ties."""
+    return (school["name"], school["id"])
+
 
-        # Return simplified school data for dropdown
-        schools = [
-            {
-                "id": school.get("id"),
-                "name": school.get("name"),
-                "code": school.get("code"),
-                "district": school.get("district"),
-                "block_name": school.get("block_name"),
-            }
-            for school in schools_data
-            if school.get("name")
-        ]
+def get_sorted_dropdown_schools(query_params: Dict[str, Any]) -> Optional[list]:
+    """Get the dropdown records of every school matching the filters, in listing order."""
+    schools_data = get_schools_by_location(query_params, "Could not fetch schools!")
+    if schools_data is None:
+        return None
 
-        # Sort by name
-        schools.sort(key=lambda x: x["name"])
+    schools = [
+        to_dropdown_school(school) for school in schools_data if school.get("name")
+    ]
+    schools.sort(key=school_sort_key)
+    return schools
+
+
+def get_schools_for_dropdown_by_filters(
+    auth_group: Optional[str] = None,
+    state: Optional[str] = None,
+    district: Optional[str] = None,
+    block: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Get list of schools for dropdown, filtered by location hierarchy and sorted
+    by name (then id). See school_directory_service.get_school_page for pages.
+    """
+    query_params = build_school_location_params(auth_group, state, district, block)
+    logger.info(f"Fetching schools for dropdown with params: {query_params}")
 
-        logger.info(f"Found {len(schools)} schools")
-        return {"schools": schools}
+    schools = get_sorted_dropdown_schools(query_params)
+    if schools is None:
+        return {"schools": []}
 
-    return {"schools": []}
+    logger.info(f"Found {len(schools)} schools")
+    return {"schools": schools}
 
 
 def get_dependant_field_mapping_for_auth_group(
-    auth_group: str, include_blocks: bool = False
+    auth_group: str, include_blocks: bool = False, locale: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Generate dependantFieldMapping for district->school or district->block->school hierarchy.
     This replaces manual google sheets and prevents data mismatches!
 
     Returns the exact structure needed for form schema dependantFieldMapping.
+    Option lists are keyed by every supported locale, or only by `locale` if given.
     """
     if auth_group not in authgroup_state_mapping:
         logger.warning(f"Unknown auth_group: {auth_group}")
@@ -452,21 +517,48 @@ def get_dependant_field_mapping_for_auth_group(
         f"Generating dependant mapping for '{auth_group}' -> '{state}', include_blocks: {include_blocks}"
     )
 
-    # Single API call to get all schools for this state
-    response = requests.get(
-        school_db_url, params={"state": state}, headers=db_request_token()
+    # Single snapshot read or API call to get all schools for this state
+    schools_data = get_schools_by_location(
+        {"state": state}, "Could not fetch schools for dependant mapping!"
     )
-
-    if not is_response_valid(
-        response, "Could not fetch schools for dependant mapping!"
-    ):
+    if schools_data is None:
         return {"error": "Database error"}
 
-    schools_data = response.json()
-    if not isinstance(schools_data, list):
-        schools_data = [schools_data]
+    hierarchy = build_school_hierarchy(auth_group, schools_data)
+
+    if include_blocks:
+        # District -> Block -> School hierarchy
+        return {
+            "auth_group": auth_group,
+            "state": state,
+            "has_blocks": True,
+            "district_block_mapping": {
+                district: localize(blocks, locale)
+                for district, blocks in hierarchy["district_blocks"].items()
+            },
+            "block_school_mapping": {
+                block: localize(school_names, locale)
+                for block, school_names in hierarchy["block_schools"].items()
+            },
+        }
+
+    else:
+        # Simple District -> School hierarchy
+        return {
+            "auth_group": auth_group,
+            "state": state,
+            "has_blocks": False,
+            "district_school_mapping": {
+                district: localize(school_names, locale)
+                for district, school_names in hierarchy["district_schools"].items()
+            },
+        }
 
-    # Apply same filtering logic as get_districts_by_filters for consistency
+
+def filter_schools_for_auth_group(
+    auth_group: str, schools: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Keep the schools an auth group registers for, as in get_districts_by_filters."""
     filtered_schools = []
     chhattisgarh_districts = "Bastar+DANTEWADA+Dhamtari+Durg+Gariaband+Janjgir - Champa+Jashpur+Raigarh+Raipur+Rajnandgaon".split(
         "+"
@@ -474,7 +566,7 @@ def get_dependant_field_mapping_for_auth_group(
     maharashtra_districts = ["Gadchiroli", "Bhandara"]
     bihar_districts = ["Begusarai"]
     gujarat_districts = set(GUJARAT_DISTRICT_SCHOOL_MAPPING)
-    for school in schools_data:
+    for school in schools:
         if school.get("district"):
             if auth_group == "PunjabTeachers":
                 if school.get("af_school_category") in ["SoE", "RSMS"]:
@@ -497,78 +589,42 @@ def get_dependant_field_mapping_for_auth_group(
                     filtered_schools.append(school)
             else:
                 filtered_schools.append(school)
+    return filtered_schools
 
-    if include_blocks:
-        # District -> Block -> School hierarchy
-        district_block_mapping = {}
-        block_school_mapping = {}
-
-        for school in filtered_schools:
-            district = school.get("district")
-            block = school.get("block_name")
-            school_name = school.get("name")
-
-            if not district or not school_name:
-                continue
-
-            # Build district -> blocks mapping
-            if district not in district_block_mapping:
-                district_block_mapping[district] = {"en": [], "hi": []}
-
-            if block:
-                if block not in district_block_mapping[district]["en"]:
-                    district_block_mapping[district]["en"].append(block)
-                    district_block_mapping[district]["hi"].append(block)
-
-                # Build block -> schools mapping
-                if block not in block_school_mapping:
-                    block_school_mapping[block] = {"en": [], "hi": []}
-
-                block_school_mapping[block]["en"].append(school_name)
-                block_school_mapping[block]["hi"].append(school_name)
-
-        # Sort everything
-        for district_data in district_block_mapping.values():
-            district_data["en"].sort()
-            district_data["hi"].sort()
-        for block_data in block_school_mapping.values():
-            block_data["en"].sort()
-            block_data["hi"].sort()
-
-        return {
-            "auth_group": auth_group,
-            "state": state,
-            "has_blocks": True,
-            "district_block_mapping": district_block_mapping,
-            "block_school_mapping": block_school_mapping,
-        }
-
-    else:
-        # Simple District -> School hierarchy
-        district_school_mapping = {}
-
-        for school in filtered_schools:
-            district = school.get("district")
-            school_name = school.get("name")
-
-            if not district or not school_name:
-                continue
-
-            if district not in district_school_mapping:
-                district_school_mapping[district] = {"en": [], "hi": []}
-
-            if school_name not in district_school_mapping[district]["en"]:
-                district_school_mapping[district]["en"].append(school_name)
-                district_school_mapping[district]["hi"].append(school_name)
-
-        # Sort everything
-        for district_data in district_school_mapping.values():
-            district_data["en"].sort()
-            district_data["hi"].sort()
 
-        return {
-            "auth_group": auth_group,
-            "state": state,
-            "has_blocks": False,
-            "district_school_mapping": district_school_mapping,
-        }
+def build_school_hierarchy(
+    auth_group: str, schools: List[Dict[str, Any]]
+) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Build sorted district -> schools, district -> blocks and block -> schools
+    lists for the schools an auth group registers for.
+    """
+    district_schools = {}
+    district_blocks = {}
+    block_schools = {}
+
+    for school in filter_schools_for_auth_group(auth_group, schools):
+        district = school.get("district")
+        block = school.get("block_name")
+        school_name = school.get("name")
+
+        if not district or not school_name:
+            continue
+
+        district_schools.setdefault(district, set()).add(school_name)
+        district_blocks.setdefault(district, set())
+        if block:
+            district_blocks[district].add(block)
+            block_schools.setdefault(block, []).append(school_name)
+
+    return {
+        "district_schools": {
+            district: sorted(names) for district, names in district_schools.items()
+        },
+        "district_blocks": {
+            district: sorted(blocks) for district, blocks in district_blocks.items()
+        },
+        "block_schools": {
+            block: sorted(names) for block, names in block_schools.items()
+        },
+    }
@@ -0,0 +1,312 @@
+"""School directory snapshot bundled with the deployment.
+
+The snapshot is a read-only SQLite file exported at build time (see
+`python cli.py export-school-snapshot`) and packaged with `app/`, so cold
+Lambda containers can read school lists without calling the DB service.
+Before a query is answered from the snapshot, the DB service is asked for
+one school past the snapshot's rows for the same filters, so schools added
+since the export are never hidden.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import requests
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from cache import TTLCache
+from logger_config import get_logger
+from routes import school_db_url
+from settings import settings
+from helpers import db_request_token, is_response_valid
+
+logger = get_logger()
+
+APP_DIR = Path(__file__).resolve().parent.parent
+SCHOOL_SNAPSHOT_PATH = APP_DIR / "data" / "school_directory.sqlite"
+SNAPSHOT_COLUMNS = [
+    "id",
+    "name",
+    "code",
+    "udise_code",
+    "district",
+    "block_name",
+    "state",
+    "af_school_category",
+]
+# Location filters that can be answered from the snapshot
+SNAPSHOT_FILTERS = ["state", "district", "block_name"]
+EXPORT_PAGE_SIZE = 2000
+
+_connection = None
+_snapshot_info = None
+_connection_lock = threading.Lock()
+
+# Whether the DB service has schools beyond the snapshot's rows, per filter set
+_new_schools_checks = TTLCache(ttl_seconds=settings.SCHOOL_DIRECTORY_TTL_SECONDS)
+
+
+def _open_snapshot() -> Optional[sqlite3.Connection]:
+    """Open the bundled snapshot read-only, memory-mapped, once per container."""
+    global _connection, _snapshot_info
+
+    with _connection_lock:
+        if _connection is not None:
+            return _connection
+        if not SCHOOL_SNAPSHOT_PATH.exists():
+            return None
+
+        try:
+            connection = sqlite3.connect(
+                f"file:{SCHOOL_SNAPSHOT_PATH}?mode=ro&immutable=1",
+                uri=True,
+                check_same_thread=False,
+            )
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA mmap_size = 268435456")
+            meta = dict(connection.execute("SELECT key, value FROM meta").fetchall())
+        except sqlite3.Error as e:
+            logger.error(f"Could not open school snapshot: {e}")
+            return None
+
+        _connection = connection
+        _snapshot_info = {
+            "version": meta.get("version"),
+            "generated_at": meta.get("generated_at"),
+            "school_count": int(meta.get("school_count", 0)),
+        }
+        logger.info(f"Loaded school snapshot: {_snapshot_info}")
+        return _connection
+
+
+def get_snapshot_info() -> Optional[Dict[str, Any]]:
+    """Return the version stamp of the bundled snapshot, if one is packaged."""
+    if _open_snapshot() is None:
+        return None
+    return _snapshot_info
+
+
+def is_snapshot_fresh() -> bool:
+    """Check that a snapshot is packaged and younger than the configured max age."""
+    info = get_snapshot_info()
+    if not info or not info.get("generated_at"):
+        return False
+
+    generated_at = datetime.fromisoformat(info["generated_at"])
+    max_age = timedelta(hours=settings.SCHOOL_SNAPSHOT_MAX_AGE_HOURS)
+    if datetime.now(timezone.utc) - generated_at > max_age:
+        logger.warning(
+            f"School snapshot {info['version']} is stale, falling back to DB service"
+        )
+        return False
+    return True
+
+
+def _snapshot_filters(filters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The filters without None values, or None if the snapshot can't answer them."""
+    filters = {k: v for k, v in filters.items() if v is not None}
+    if any(key not in SNAPSHOT_FILTERS for key in filters):
+        return None
+    if not is_snapshot_fresh():
+        return None
+    return filters
+
+
+def _query_snapshot(sql: str, params: List[Any]) -> Optional[List[sqlite3.Row]]:
+    try:
+        with _connection_lock:
+            return _connection.execute(sql, params).fetchall()
+    except sqlite3.Error as e:
+        logger.error(f"School snapshot query failed: {e}")
+        return None
+
+
+def _is_snapshot_complete(filters: Dict[str, Any], snapshot_count: int) -> bool:
+    if _has_new_schools(filters, snapshot_count):
+        logger.info(
+            f"DB service has schools missing from the snapshot for {filters}, "
+            f"falling back to DB service"
+        )
+        return False
+    return True
+
+
+def query_snapshot_schools(**filters) -> Optional[List[Dict[str, Any]]]:
+    """
+    Get schools matching location filters from the snapshot.
+
+    Returns None when the snapshot cannot answer the query (missing, stale, or
+    filtered on something other than state/district/block_name), in which case
+    the caller should query the DB service instead.
+    """
+    filters = _snapshot_filters(filters)
+    if filters is None:
+        return None
+
+    where = " AND ".join(f"{key} = ?" for key in filters)
+    sql = f"SELECT {', '.join(SNAPSHOT_COLUMNS)} FROM school"
+    if where:
+        sql += f" WHERE {where}"
+    sql += " ORDER BY id"
+
+    rows = _query_snapshot(sql, list(filters.values()))
+    if rows is None or not _is_snapshot_complete(filters, len(rows)):
+        return None
+    return [dict(row) for row in rows]
+
+
+def query_snapshot_school_page(
+    filters: Dict[str, Any], after: Optional[tuple], limit: int
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Get up to `limit` named schools matching location filters from the
+    snapshot, in (name, id) order, starting after the (name, id) `after`.
+
+    Only the page is read; returns None when the snapshot cannot answer, as
+    query_snapshot_schools does.
+    """
+    filters = _snapshot_filters(filters)
+    if filters is None:
+        return None
+
+    conditions = [f"{key} = ?" for key in filters]
+    count_sql = "SELECT COUNT(*) FROM school"
+    if conditions:
+        count_sql += f" WHERE {' AND '.join(conditions)}"
+    count = _query_snapshot(count_sql, list(filters.values()))
+    if count is None or not _is_snapshot_complete(filters, count[0][0]):
+        return None
+
+    conditions.append("name IS NOT NULL AND name != ''")
+    params = list(filters.values())
+    if after is not None:
+        conditions.append("(name, id) > (?, ?)")
+        params.extend(after)
+    sql = (
+        f"SELECT {', '.join(SNAPSHOT_COLUMNS)} FROM school "
+        f"WHERE {' AND '.join(conditions)} ORDER BY name, id LIMIT ?"
+    )
+    rows = _query_snapshot(sql, params + [limit])
+    if rows is None:
+        return None
+    return [dict(row) for row in rows]
+
+
+def _has_new_schools(filters: Dict[str, Any], snapshot_count: int) -> bool:
+    """
+    Check whether the DB service has more schools for the filters than the
+    snapshot, by fetching one school past the snapshot's rows. The answer is
+    cached per filter set; if the DB service can't be reached the snapshot is
+    trusted.
+    """
+    cache_key = tuple(sorted(filters.items()))
+    checked = _new_schools_checks.get(cache_key)
+    if checked is not None:
+        return checked == "new"
+
+    try:
+        response = requests.get(
+            school_db_url,
+            params={**filters, "offset": snapshot_count, "limit": 1},
+            headers=db_request_token(),
+        )
+    except requests.RequestException as e:
+        logger.warning(f"Could not check the school snapshot against DB: {e}")
+        return False
+    if not is_response_valid(response):
+        logger.warning("Could not check the school snapshot against DB")
+        return False
+
+    has_new = bool(response.json())
+    _new_schools_checks.set(cache_key, "new" if has_new else "current")
+    return has_new
+
+
+def _fetch_all_schools() -> List[Dict[str, Any]]:
+    """
+    Fetch every school from the DB service, page by page.
+
+    The DB service may cap pages below EXPORT_PAGE_SIZE, so the offset moves
+    by the rows actually returned and only an empty page ends the export.
+    Raises if a school is returned twice (pages are not stably ordered) or
+    no schools are returned, so a partial snapshot is never written.
+    """
+    schools: Dict[Any, Dict[str, Any]] = {}
+    offset = 0
+    while True:
+        response = requests.get(
+            school_db_url,
+            params={"offset": offset, "limit": EXPORT_PAGE_SIZE},
+            headers=db_request_token(),
+        )
+        is_response_valid(response, "Could not fetch schools for the snapshot!")
+
+        page = response.json()
+        if not isinstance(page, list):
+            page = [page] if page else []
+        if not page:
+            break
+
+        for school in page:
+            if school.get("id") in schools:
+                raise RuntimeError(
+                    f"School {school.get('id')} was returned twice while paging; "
+                    f"the snapshot would be incomplete"
+                )
+            schools[school.get("id")] = {
+                column: school.get(column) for column in SNAPSHOT_COLUMNS
+            }
+        offset += len(page)
+        logger.info(f"Fetched {len(schools)} schools for the snapshot")
+
+    if not schools:
+        raise RuntimeError("DB service returned no schools for the snapshot")
+    return list(schools.values())
+
+
+def export_school_snapshot(path: Path = SCHOOL_SNAPSHOT_PATH) -> Dict[str, Any]:
+    """Export the school directory from the DB service into a snapshot file."""
+    schools = sorted(_fetch_all_schools(), key=lambda school: school["id"])
+    version = hashlib.sha256(
+        json.dumps(schools, sort_keys=True, default=str).encode()
+    ).hexdigest()[:16]
+    meta = {
+        "version": version,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "school_count": str(len(schools)),
+    }
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    connection = sqlite3.connect(tmp_path)
+    try:
+        connection.execute(
+            f"CREATE TABLE school ({', '.join(SNAPSHOT_COLUMNS)}, PRIMARY KEY (id))"
+        )
+        connection.executemany(
+            f"INSERT INTO school VALUES ({', '.join('?' * len(SNAPSHOT_COLUMNS))})",
+            [[school[column] for column in SNAPSHOT_COLUMNS] for school in schools],
+        )
+        connection.execute(
+            "CREATE INDEX school_location ON school (state, district, block_name)"
+        )
+        connection.execute("CREATE INDEX school_listing ON school (state, name, id)")
+        connection.execute("CREATE INDEX school_code ON school (code)")
+        connection.execute("CREATE INDEX school_udise_code ON school (udise_code)")
+        connection.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        connection.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+        connection.commit()
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+
+    os.replace(tmp_path, path)
+    logger.info(f"Exported school snapshot to {path}: {meta}")
+    return meta
@@ -0,0 +1,81 @@
+"""Identity index: which student an identifier belongs to.
+
+Maps each student's student_id, apaar_id, phone and user_id to their identity
+(record id and all four identifiers), so a lookup that would race its
+fallbacks can run the student_id lookup alone when the value is known to be a
+student_id. The index only decides whether the fallbacks start before or after
+the student_id lookup, it never skips that lookup and never answers on its
+own: a stale entry costs one extra lookup, not a wrong answer.
+Entries are kept per Lambda container for STUDENT_IDENTITY_TTL_SECONDS and
+written through on every student read, create and update made by this
+container.
+"""
+
+from typing import Any, NamedTuple, Optional
+from cache import TTLCache
+from logger_config import get_logger
+from settings import settings
+
+logger = get_logger()
+
+IDENTITY_KEYS = ["student_id", "apaar_id", "phone", "user_id"]
+
+_identity_index = TTLCache(
+    ttl_seconds=settings.STUDENT_IDENTITY_TTL_SECONDS, max_entries=20000
+)
+
+
+class StudentIdentity(NamedTuple):
+    id: Any
+    student_id: Optional[str]
+    apaar_id: Optional[str]
+    phone: Optional[str]
+    user_id: Optional[str]
+
+
+def _str_or_none(value: Any) -> Optional[str]:
+    return str(value) if value not in (None, "") else None
+
+
+def identity_from_record(record: Any) -> Optional[StudentIdentity]:
+    """Build the identity of a student record, or None if it has no record id."""
+    if not isinstance(record, dict) or record.get("id") is None:
+        return None
+
+    user = record.get("user") if isinstance(record.get("user"), dict) else {}
+    return StudentIdentity(
+        id=record["id"],
+        student_id=_str_or_none(record.get("student_id")),
+        apaar_id=_str_or_none(record.get("apaar_id")),
+        phone=_str_or_none(user.get("phone") or record.get("phone")),
+        user_id=_str_or_none(record.get("user_id") or user.get("id")),
+    )
+
+
+def index_student_record(record: Any) -> Optional[StudentIdentity]:
+    """Write a student record's identity into the index under each identifier."""
+    identity = identity_from_record(record)
+    if identity is None:
+        return None
+    for key in IDENTITY_KEYS:
+        value = getattr(identity, key)
+        if value is not None:
+            _identity_index.set((key, value), identity)
+    return identity
+
+
+def evict_student_identity(identity: Optional[StudentIdentity]):
+    """Drop every identifier of an identity, e.g. before its identifiers change."""
+    if identity is None:
+        return
+    for key in IDENTITY_KEYS:
+        value = getattr(identity, key)
+        if value is not None:
+            _identity_index.pop((key, value))
+
+
+def lookup_student_identity(key: str, value: Any) -> Optional[StudentIdentity]:
+    """Get an identity from the index only, without calling the DB."""
+    if value in (None, ""):
+        return None
+    return _identity_index.get((key, str(value)))
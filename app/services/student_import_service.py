@@ -0,0 +1,238 @@
+"""Bulk student import from CSV or NDJSON files, run from `python cli.py
+import-students` rather than the API: a large import outlasts the Lambda
+timeout, and API Gateway would buffer the per-row results anyway."""
+
+import asyncio
+import csv
+import io
+import json
+from typing import Dict, Any, AsyncIterator, List, Optional
+from fastapi import HTTPException
+from logger_config import get_logger
+from helpers import validate_and_build_query_params
+from mapping import authgroup_state_mapping
+from services.batch_service import get_batch_by_id
+from services.school_directory_service import resolve_school, school_not_found_detail
+from services.student_service import (
+    G12_REGISTRATION_AUTH_GROUPS,
+    STUDENT_CREATE_PARAMS,
+    create_student,
+    resolve_g12_registration_grade_and_batch,
+)
+
+logger = get_logger()
+
+IMPORT_FORMATS = ["csv", "ndjson"]
+# Students created at once during an import
+STUDENT_IMPORT_CONCURRENCY = 8
+# Fields holding several values, separated by ";" in CSV files
+LIST_FIELDS = ["planned_competitive_exams"]
+# Fields holding true/false, which CSV files can only give as text
+BOOLEAN_FIELDS = ["batch_registration"]
+BOOLEAN_VALUES = {
+    "true": True,
+    "yes": True,
+    "1": True,
+    "false": False,
+    "no": False,
+    "0": False,
+}
+# Identifiers that may appear on only one row of an import
+UNIQUE_FIELDS = ["student_id", "apaar_id", "phone"]
+
+
+def parse_import_rows(content: bytes, import_format: str) -> List[Dict[str, Any]]:
+    """Parse an uploaded CSV (with a header row) or NDJSON file into form rows."""
+    if import_format not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"format must be one of: {', '.join(IMPORT_FORMATS)}",
+        )
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Import file must be UTF-8")
+
+    rows = []
+    if import_format == "csv":
+        for row in csv.DictReader(io.StringIO(text)):
+            row = {
+                key.strip(): value.strip()
+                for key, value in row.items()
+                if key and value and value.strip()
+            }
+            for field in LIST_FIELDS:
+                if field in row:
+                    row[field] = [v.strip() for v in row[field].split(";") if v.strip()]
+            for field in BOOLEAN_FIELDS:
+                if field in row:
+                    # Unknown values are kept and rejected by validate_import_row
+                    row[field] = BOOLEAN_VALUES.get(row[field].lower(), row[field])
+            rows.append(row)
+        return rows
+
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            raise HTTPException(
+                status_code=400, detail=f"Line {line_number} is not valid JSON"
+            )
+        if not isinstance(row, dict):
+            raise HTTPException(
+                status_code=400, detail=f"Line {line_number} is not a JSON object"
+            )
+        rows.append(row)
+    return rows
+
+
+def validate_import_row(
+    row: Dict[str, Any], auth_group: str, checked_batches: Dict[str, Optional[str]]
+) -> Optional[str]:
+    """
+    Run the checks create_student would fail on, without writing anything.
+    Returns the error message, or None if the row is valid. `checked_batches`
+    carries batch lookups across rows so each batch is fetched once.
+    """
+    try:
+        query_params = validate_and_build_query_params(row, STUDENT_CREATE_PARAMS)
+        for field in BOOLEAN_FIELDS:
+            if field in query_params and not isinstance(query_params[field], bool):
+                return f"{field} must be true or false"
+
+        if "school_name" in query_params:
+            district = query_params.get("district")
+            if not district:
+                return "District is required when school name is provided"
+            school_data, suggestions = resolve_school(
+                query_params["school_name"],
+                district,
+                authgroup_state_mapping.get(auth_group, ""),
+                query_params.get("block_name"),
+            )
+            if not school_data or "id" not in school_data:
+                return school_not_found_detail(
+                    query_params["school_name"], district, suggestions
+                )
+
+        if auth_group in G12_REGISTRATION_AUTH_GROUPS:
+            if query_params.get("g12_graduating_year") in (None, ""):
+                return f"g12_graduating_year is required for {auth_group}"
+            g12_registration_data = resolve_g12_registration_grade_and_batch(
+                auth_group, query_params["g12_graduating_year"]
+            )
+            batch_id = g12_registration_data["batch_id"]
+            if query_params.get("batch_registration"):
+                if batch_id not in checked_batches:
+                    try:
+                        found = get_batch_by_id(batch_id)
+                    except HTTPException:
+                        found = None
+                    checked_batches[batch_id] = (
+                        None
+                        if found
+                        else f"Default {auth_group} registration batch '{batch_id}' does not exist"
+                    )
+                if checked_batches[batch_id]:
+                    return checked_batches[batch_id]
+    except HTTPException as e:
+        return e.detail
+    return None
+
+
+def find_duplicate_rows(
+    rows: List[Dict[str, Any]], errors: List[Optional[str]]
+) -> List[Optional[str]]:
+    """
+    Reject valid rows repeating an identifier of an earlier valid row, since
+    creating both at once would create the student twice. Returns the errors
+    with those rows' errors filled in.
+    """
+    errors = list(errors)
+    first_rows: Dict[tuple, int] = {}
+    for index, row in enumerate(rows):
+        if errors[index]:
+            continue
+        keys = [
+            (field, str(row[field]))
+            for field in UNIQUE_FIELDS
+            if row.get(field) not in (None, "")
+        ]
+        repeated = next((key for key in keys if key in first_rows), None)
+        if repeated:
+            field, value = repeated
+            errors[index] = (
+                f"Duplicate {field} '{value}', already in row {first_rows[repeated]}"
+            )
+            continue
+        for key in keys:
+            first_rows[key] = index
+    return errors
+
+
+async def import_students(
+    rows: List[Dict[str, Any]],
+    auth_group: str,
+    id_generation: bool,
+    dry_run: bool = False,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Validate every row up front, then create the valid ones with bounded
+    concurrency, yielding one result per row as it completes and a summary last.
+    """
+    checked_batches: Dict[str, Optional[str]] = {}
+    errors = await asyncio.to_thread(
+        lambda: [validate_import_row(row, auth_group, checked_batches) for row in rows]
+    )
+    errors = find_duplicate_rows(rows, errors)
+    summary = {
+        "total": len(rows),
+        "invalid": 0,
+        "created": 0,
+        "existing": 0,
+        "failed": 0,
+    }
+
+    valid_rows = []
+    for index, (row, error) in enumerate(zip(rows, errors)):
+        if error:
+            summary["invalid"] += 1
+            yield {"row": index, "status": "invalid", "error": error}
+        else:
+            valid_rows.append((index, row))
+    logger.info(
+        f"Student import for {auth_group}: {len(valid_rows)} of {len(rows)} rows valid"
+    )
+
+    if dry_run:
+        for index, _ in valid_rows:
+            yield {"row": index, "status": "valid"}
+        yield {"summary": summary}
+        return
+
+    semaphore = asyncio.Semaphore(STUDENT_IMPORT_CONCURRENCY)
+
+    async def create_row(index: int, row: Dict[str, Any]) -> Dict[str, Any]:
+        data = {
+            "auth_group": auth_group,
+            "id_generation": id_generation,
+            "form_data": row,
+        }
+        async with semaphore:
+            try:
+                result = await create_student(data)
+            except HTTPException as e:
+                return {"row": index, "status": "failed", "error": e.detail}
+        status = "existing" if result.get("already_exists") else "created"
+        return {"row": index, "status": status, **result}
+
+    tasks = [create_row(index, row) for index, row in valid_rows]
+    for task in asyncio.as_completed(tasks):
+        result = await task
+        summary[result["status"]] += 1
+        yield result
+
+    logger.info(f"Student import for {auth_group} finished: {summary}")
+    yield {"summary": summary}
@@ -1,13 +1,20 @@
 """Student service for business logic without HTTP dependencies."""
 
+import asyncio
+import bisect
+import csv
+import io
+import json
 from datetime import date
 
 import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from logger_config import get_logger
 from routes import student_db_url
 from helpers import (
     db_request_token,
+    decode_keyset_cursor,
+    encode_keyset_cursor,
     is_response_valid,
     is_response_empty,
     safe_get_first_item,
@@ -17,8 +24,17 @@ from mapping import (
     USER_QUERY_PARAMS,
     ENROLLMENT_RECORD_PARAMS,
 )
-from services.exam_service import get_exam_by_name
-from services.school_service import get_school
+from services.exam_service import get_exams_by_names
+from services.student_identity_service import (
+    evict_student_identity,
+    identity_from_record,
+    index_student_record,
+    lookup_student_identity,
+)
+from services.school_directory_service import (
+    resolve_school,
+    school_not_found_detail,
+)
 from services.group_service import get_group_by_child_id_and_type
 from services.group_user_service import (
     get_group_user,
@@ -37,6 +53,56 @@ from fastapi import HTTPException
 
 logger = get_logger()
 
+# Form fields accepted when creating a student
+STUDENT_CREATE_PARAMS = (
+    STUDENT_QUERY_PARAMS
+    + USER_QUERY_PARAMS
+    + ENROLLMENT_RECORD_PARAMS
+    + SCHOOL_QUERY_PARAMS
+    + ["id_generation", "region", "batch_registration"]
+)
+
+# DB page size used when walking large student cohorts
+STUDENT_PAGE_SIZE = 500
+
+# Hard maximum number of students one listing or lookup returns
+STUDENT_PAGE_MAX_LIMIT = 500
+
+# Fields a student listing can be projected to; user fields are read from the
+# nested user record
+STUDENT_FIELDS = (
+    ["id"]
+    + STUDENT_QUERY_PARAMS
+    + [field for field in USER_QUERY_PARAMS if field != "id"]
+)
+
+EXPORT_FORMATS = ["ndjson", "csv"]
+# Columns of a CSV export when no fields are selected
+STUDENT_EXPORT_DEFAULT_FIELDS = [
+    "id",
+    "student_id",
+    "apaar_id",
+    "user_id",
+    "first_name",
+    "last_name",
+    "gender",
+    "date_of_birth",
+    "phone",
+    "grade",
+    "category",
+    "stream",
+    "district",
+    "state",
+]
+
+# Verifications run at once by POST /student/verify/bulk
+STUDENT_VERIFY_BULK_CONCURRENCY = 10
+
+# Identifiers a student can be updated by, besides the numeric record id
+STUDENT_NATURAL_KEYS = ["user_id", "student_id", "apaar_id"]
+
+# Updates applied at once by PATCH /student/bulk
+STUDENT_UPDATE_BULK_CONCURRENCY = 10
 
 G12_REGISTRATION_AUTH_GROUPS = {
     "DelhiStudents",
@@ -132,7 +198,10 @@ def resolve_delhi_registration_grade_and_batch(
 
 
 def get_students(**params) -> Optional[Dict[str, Any]]:
-    """Get students with flexible parameters."""
+    """
+    Get students with flexible parameters, at most STUDENT_PAGE_MAX_LIMIT of
+    them. Raises 400 if more students match; page with get_students_paginated.
+    """
     # Filter out None values and validate against allowed params
     valid_params = STUDENT_QUERY_PARAMS + USER_QUERY_PARAMS + ENROLLMENT_RECORD_PARAMS
     query_params = {
@@ -141,38 +210,303 @@ def get_students(**params) -> Optional[Dict[str, Any]]:
 
     logger.info(f"Fetching students with params: {query_params}")
 
+    # One row past the maximum tells whether more students match
     response = requests.get(
-        student_db_url, params=query_params, headers=db_request_token()
+        student_db_url,
+        params={**query_params, "limit": STUDENT_PAGE_MAX_LIMIT + 1},
+        headers=db_request_token(),
     )
 
     if is_response_valid(response, "Student API could not fetch the data!"):
         student_data = is_response_empty(response.json(), False)
+        check_student_listing_size(student_data)
         logger.info("Successfully retrieved student data")
         return student_data
 
     return None
 
 
+def check_student_listing_size(students: Any):
+    """Raise 400 if an unpaged listing returned more than STUDENT_PAGE_MAX_LIMIT students."""
+    if isinstance(students, list) and len(students) > STUDENT_PAGE_MAX_LIMIT:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"More than {STUDENT_PAGE_MAX_LIMIT} students match, "
+                "narrow the filters or page with limit/cursor"
+            ),
+        )
+
+
+def get_students_page(offset: int, limit: int, **params) -> list:
+    """Get one page of students matching the filters, in DB (id) order."""
+    valid_params = STUDENT_QUERY_PARAMS + USER_QUERY_PARAMS + ENROLLMENT_RECORD_PARAMS
+    query_params = {
+        k: v for k, v in params.items() if v is not None and k in valid_params
+    }
+
+    logger.info(
+        f"Fetching student page with params: {query_params}, offset: {offset}, limit: {limit}"
+    )
+
+    response = requests.get(
+        student_db_url,
+        params={**query_params, "offset": offset, "limit": limit},
+        headers=db_request_token(),
+    )
+
+    if is_response_valid(response, "Student API could not fetch the data!"):
+        students_data = response.json()
+        if not isinstance(students_data, list):
+            students_data = [students_data] if students_data else []
+        return students_data
+
+    return []
+
+
+def _check_id_order(students: list, after_id: Any = None):
+    ids = [student.get("id") for student in students]
+    if after_id is not None:
+        ids.insert(0, after_id)
+    if any(previous >= current for previous, current in zip(ids, ids[1:])):
+        logger.error("Student API returned a page out of id order")
+        raise HTTPException(
+            status_code=500, detail="Student API did not return students in id order"
+        )
+
+
+def _get_students_after(
+    after_id: Any, offset: int, count: int, **params
+) -> Tuple[list, int]:
+    """
+    Get up to `count` students with an id above `after_id`, in id order.
+
+    The DB service pages by offset over students in id order, so `offset` is
+    where the student after `after_id` was last seen. Reading starts a little
+    before it and rows up to `after_id` are dropped, so students added or
+    removed in between shift nothing. Returns the students and the offset
+    just past the last one.
+    """
+    lookback = count if after_id is not None and offset > 0 else 0
+    while True:
+        start = max(offset - lookback, 0)
+        window = get_students_page(start, lookback + count, **params)
+        _check_id_order(window)
+        if after_id is None:
+            skipped = 0
+            break
+        skipped = bisect.bisect_right([student["id"] for student in window], after_id)
+        # The window must reach back to after_id, else rows removed since the
+        # last page moved the rest further back than the lookback
+        if skipped > 0 or start == 0:
+            break
+        lookback *= 2
+
+    students = window[skipped:]
+    position = start + len(window)
+    exhausted = len(window) < lookback + count
+    while len(students) < count and not exhausted:
+        wanted = count - len(students)
+        more = get_students_page(position, wanted, **params)
+        _check_id_order(more, students[-1]["id"] if students else after_id)
+        students.extend(more)
+        position += len(more)
+        exhausted = len(more) < wanted
+
+    students = students[:count]
+    return students, start + skipped + len(students)
+
+
+def iter_student_pages(page_size: int = STUDENT_PAGE_SIZE, **params) -> Iterator[list]:
+    """Yield pages of students matching the filters, in id order, until the DB runs out."""
+    after_id, offset = None, 0
+    while True:
+        page, offset = _get_students_after(after_id, offset, page_size, **params)
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        after_id = page[-1]["id"]
+
+
+def get_students_paginated(
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    **params,
+) -> Dict[str, Any]:
+    """
+    Get one page of students matching the filters, in id order, along with a
+    `next_cursor` (the last id returned and where it was) for the following
+    page. Records are projected to `fields` when given.
+    """
+    limit = min(limit or STUDENT_PAGE_MAX_LIMIT, STUDENT_PAGE_MAX_LIMIT)
+    position = decode_keyset_cursor(cursor, ["id", "offset"])
+    after_id, offset = None, 0
+    if position:
+        after_id, offset = position["id"], position["offset"]
+        if not isinstance(offset, int) or offset < 0 or not isinstance(after_id, int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # Fetch one extra row to know whether another page exists
+    students, next_offset = _get_students_after(after_id, offset, limit + 1, **params)
+    has_more = len(students) > limit
+    students = students[:limit]
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_keyset_cursor(
+            {"id": students[-1]["id"], "offset": next_offset - 1}
+        )
+    if fields:
+        students = [project_student_record(student, fields) for student in students]
+
+    return {"students": students, "next_cursor": next_cursor}
+
+
+def parse_student_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma separated `fields` parameter into a list of student fields."""
+    if not fields:
+        return None
+    field_list = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    invalid_fields = [field for field in field_list if field not in STUDENT_FIELDS]
+    if invalid_fields:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Field(s) {', '.join(invalid_fields)} cannot be selected",
+        )
+    return field_list or None
+
+
+def get_student_field(record: Dict[str, Any], field: str) -> Any:
+    """Get a field of a student record, falling back to its nested user record."""
+    if field in record:
+        return record[field]
+    user_record = record.get("user")
+    if isinstance(user_record, dict):
+        return user_record.get(field)
+    return None
+
+
+def project_student_record(record: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """Flatten a student record to the selected fields."""
+    return {field: get_student_field(record, field) for field in fields}
+
+
+def _csv_value(value: Any) -> Any:
+    """Flatten a field value into a CSV cell; lists are joined with ";" as on import."""
+    if isinstance(value, list):
+        return ";".join(str(item) for item in value)
+    if isinstance(value, dict):
+        return json.dumps(value, default=str)
+    return value
+
+
+def iter_student_export(
+    export_format: str,
+    fields: Optional[List[str]] = None,
+    max_rows: Optional[int] = None,
+    **params,
+) -> Iterator[str]:
+    """
+    Yield students matching the filters as NDJSON lines or CSV rows, one chunk
+    per DB page. NDJSON records are complete unless fields are selected; CSV
+    defaults to a standard set of columns. Raises 400 while iterating once
+    more than `max_rows` students match.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}",
+        )
+    if export_format == "csv":
+        fields = fields or STUDENT_EXPORT_DEFAULT_FIELDS
+    return _student_export_chunks(export_format, fields, max_rows, params)
+
+
+def _student_export_chunks(
+    export_format: str,
+    fields: Optional[List[str]],
+    max_rows: Optional[int],
+    params: Dict[str, Any],
+) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == "csv":
+        writer.writerow(fields)
+        yield buffer.getvalue()
+
+    exported = 0
+    for page in iter_student_pages(**params):
+        buffer.seek(0)
+        buffer.truncate()
+        for student in page:
+            record = project_student_record(student, fields) if fields else student
+            if export_format == "csv":
+                writer.writerow([_csv_value(record[field]) for field in fields])
+            else:
+                buffer.write(json.dumps(record, default=str) + "\n")
+        exported += len(page)
+        if max_rows is not None and exported > max_rows:
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    f"More than {max_rows} students match, narrow the filters "
+                    "or export with 'python cli.py export-students'"
+                ),
+            )
+        yield buffer.getvalue()
+
+    logger.info(f"Exported {exported} students with params: {params}")
+
+
+def _index_students(students: Any) -> Any:
+    if isinstance(students, list):
+        for student in students:
+            index_student_record(student)
+    return students
+
+
 def get_student_by_id(student_id: str) -> Optional[Dict[str, Any]]:
     """Get student by student_id."""
     students = get_students(student_id=student_id)
     if students:
-        return students
+        return _index_students(students)
 
     # Fallback to apaar_id for auth groups where student_id may map to apaar_id
-    return get_students(apaar_id=student_id)
+    return _index_students(get_students(apaar_id=student_id))
+
 
+async def get_student_by_id_concurrently(student_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get student by student_id, racing the apaar_id fallback lookup.
+
+    Both lookups start together; a student_id match is returned as soon as it
+    arrives, otherwise the apaar_id result is used, as in get_student_by_id.
+    When the identity index knows the value as a student_id, the student_id
+    lookup runs alone and the apaar_id one only runs if it misses.
+    """
+    if lookup_student_identity("student_id", student_id):
+        return await asyncio.to_thread(get_student_by_id, student_id)
+
+    by_student_id = asyncio.ensure_future(
+        asyncio.to_thread(get_students, student_id=student_id)
+    )
+    by_apaar_id = asyncio.ensure_future(
+        asyncio.to_thread(get_students, apaar_id=student_id)
+    )
 
-async def verify_student_by_id(student_id: str, **params) -> bool:
-    """Verify student exists - simplified version for internal use."""
     try:
-        student_data = get_students(student_id=student_id, **params)
-        return bool(
-            student_data and (isinstance(student_data, list) and len(student_data) > 0)
-        )
-    except Exception as e:
-        logger.error(f"Error verifying student {student_id}: {str(e)}")
-    return False
+        students = await by_student_id
+    except BaseException:
+        by_apaar_id.cancel()
+        raise
+
+    if students:
+        # Retrieve the fallback's outcome so an error there is not reported
+        by_apaar_id.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return _index_students(students)
+
+    return _index_students(await by_apaar_id)
 
 
 def normalize_student_record(student_response: Any) -> Dict[str, Any]:
@@ -220,42 +554,12 @@ def build_student_signup_response(
     }
 
 
-async def update_student_data(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    """Update student record."""
-    logger.info("Updating student record")
-
-    try:
-        # Extract ID for URL path and remove from data payload
-        student_record_id = data.pop("id", None)
-        if not student_record_id:
-            logger.error("No student ID found in data for PATCH request")
-            return None
-
-        # Build URL with ID in path: /api/student/86081
-        patch_url = f"{student_db_url}/{student_record_id}"
-
-        response = requests.patch(patch_url, json=data, headers=db_request_token())
-
-    except requests.exceptions.RequestException as e:
-        logger.error(f"PATCH Request failed with exception: {e}")
-        raise
-
-    if is_response_valid(response, "Student API could not patch the data!"):
-        updated_data = is_response_empty(
-            response.json(), True, "Student API could not fetch the patched student"
-        )
-        logger.info("Successfully updated student record")
-        return updated_data
-
-    return None
-
-
 def process_exams(student_exam_texts: list) -> list:
     """Process exam texts and return exam IDs."""
     student_exam_ids = []
     try:
-        for exam_name in student_exam_texts:
-            exam_data = get_exam_by_name(exam_name)
+        exams = get_exams_by_names(student_exam_texts)
+        for exam_name, exam_data in zip(student_exam_texts, exams):
             if exam_data and "id" in exam_data:
                 student_exam_ids.append(exam_data["id"])
             else:
@@ -287,19 +591,15 @@ def validate_school_exists(
             f"Validating school: {school_name}, {district}, {state}, block: {block_name}"
         )
 
-        school_params = {"name": str(school_name), "district": str(district)}
-        if state:
-            school_params["state"] = state
-        if block_name:
-            school_params["block_name"] = str(block_name)
-
-        school_data = get_school(**school_params)
+        school_data, suggestions = resolve_school(
+            school_name, district, state, block_name
+        )
 
         if not school_data or "id" not in school_data:
             logger.warning(
                 f"School not found during validation: {school_name}, {district}"
             )
-            return False, f"School '{school_name}' not found in district '{district}'"
+            return False, school_not_found_detail(school_name, district, suggestions)
 
         group_data = get_group_by_child_id_and_type(
             child_id=school_data["id"], group_type="school"
@@ -348,6 +648,96 @@ def build_student_and_user_data(student_data: Dict[str, Any]) -> Dict[str, Any]:
     return data
 
 
+def _normalize_field_value(value: Any) -> Any:
+    """Normalize a field value so form input and stored values compare equal."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (list, tuple, set)):
+        return sorted(str(item) for item in value)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value if value else None
+
+
+def diff_student_fields(
+    student_record: Dict[str, Any], student_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Get the fields of `student_data` whose values differ from the stored
+    student record. User fields are compared against the nested `user` record.
+    """
+    user_record = student_record.get("user")
+    if not isinstance(user_record, dict):
+        user_record = {}
+
+    changed = {}
+    for key, value in student_data.items():
+        if key in USER_QUERY_PARAMS and key not in STUDENT_QUERY_PARAMS:
+            stored = user_record.get(key, student_record.get(key))
+        else:
+            stored = student_record.get(key)
+        if _normalize_field_value(value) != _normalize_field_value(stored):
+            changed[key] = value
+    return changed
+
+
+def fetch_student_by_natural_key(key: str, value: str) -> Optional[Dict[str, Any]]:
+    """Read a student by a natural key from the DB."""
+    if key == "student_id":
+        students = get_student_by_id(value)
+    else:
+        students = get_students(**{key: value})
+
+    record = normalize_student_record(students)
+    if not record:
+        return None
+    if "id" not in record:
+        logger.error(f"Invalid student data structure: {record}")
+        raise HTTPException(status_code=500, detail="Invalid student data")
+    return record
+
+
+async def update_student_changed_fields(
+    key: str, value: str, student_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Update a student addressed by user_id, student_id or apaar_id, sending
+    only the fields that differ from the stored record as read just before.
+    The read and the PATCH are not atomic: a change made in between to a
+    field that is also sent here is overwritten.
+    """
+    record = await asyncio.to_thread(fetch_student_by_natural_key, key, value)
+    if record is None:
+        logger.error(f"Student not found for {key}: {value}")
+        raise HTTPException(status_code=404, detail="Student not found")
+
+    patch_data = diff_student_fields(record, student_data)
+    changed_fields = sorted(patch_data)
+    if not patch_data:
+        logger.info("Profile details unchanged, skipping update")
+        return {**record, "changed_fields": changed_fields}
+
+    logger.info(f"Updating changed fields of student {record['id']}: {changed_fields}")
+    response = await asyncio.to_thread(
+        requests.patch,
+        f"{student_db_url}/{record['id']}",
+        json=patch_data,
+        headers=db_request_token(),
+    )
+    is_response_valid(response, "Student API could not patch the data!")
+    updated_data = is_response_empty(
+        response.json(), True, "Student API could not fetch the patched student"
+    )
+    updated_record = normalize_student_record(updated_data)
+    # Identifiers may have changed, so drop the old ones from the index
+    evict_student_identity(identity_from_record(record))
+    index_student_record(updated_record)
+
+    logger.info("Successfully updated student record")
+    return {**updated_record, "changed_fields": changed_fields}
+
+
 def create_new_student_record(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """Create new student record with proper error handling."""
     try:
@@ -410,12 +800,61 @@ def check_if_student_id_is_part_of_request(query_params: Dict[str, Any]) -> None
         )
 
 
-async def verify_student_comprehensive(query_params: Dict[str, Any]) -> Dict[str, Any]:
+class StudentLookups:
+    """
+    DB lookups made while verifying students, started once per distinct set of
+    parameters so that verifications in the same batch share them.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[tuple, asyncio.Future] = {}
+
+    def run(self, func, **params) -> asyncio.Future:
+        key = (func.__name__, tuple(sorted(params.items())))
+        if key not in self._tasks:
+            self._tasks[key] = asyncio.ensure_future(asyncio.to_thread(func, **params))
+        return self._tasks[key]
+
+
+def _find_student_record(**params) -> Optional[Dict[str, Any]]:
+    """Look up a single student record, returning None if there is no match."""
+    response = requests.get(student_db_url, params=params, headers=db_request_token())
+
+    if is_response_valid(response):
+        student_data = is_response_empty(response.json(), False)
+        if student_data:
+            record = (
+                safe_get_first_item(student_data)
+                if isinstance(student_data, list)
+                else student_data
+            )
+            index_student_record(record)
+            return record
+    return None
+
+
+def _first_student_match(
+    candidates: List[Tuple[str, Dict[str, Any]]], results: List[Any]
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """The first candidate lookup, in precedence order, that found a student."""
+    for (lookup_type, _), result in zip(candidates, results):
+        if isinstance(result, BaseException):
+            raise result
+        if result:
+            return result, lookup_type
+    return None, None
+
+
+async def verify_student_comprehensive(
+    query_params: Dict[str, Any], lookups: Optional[StudentLookups] = None
+) -> Dict[str, Any]:
     """Comprehensive student verification with multiple fallback methods.
 
     Returns a payload containing verification status and core identifiers so that
     clients don't have to re-fetch the student record after validation.
+    Pass shared `lookups` to reuse DB lookups across several verifications.
     """
+    lookups = lookups or StudentLookups()
     student_id = query_params.get("student_id")
     phone = query_params.get("phone")
     auth_group_id = query_params.get("auth_group_id")
@@ -438,65 +877,46 @@ async def verify_student_comprehensive(query_params: Dict[str, Any]) -> Dict[str
             "Detected EnableStudents auth group - will try apaar_id fallback if needed"
         )
 
-    student_record = None
-
-    # Try student_id first
-    response = requests.get(
-        student_db_url,
-        params={"student_id": student_id},
-        headers=db_request_token(),
-    )
-
-    if is_response_valid(response):
-        student_data = is_response_empty(response.json(), False)
-        if student_data:
-            student_record = (
-                safe_get_first_item(student_data)
-                if isinstance(student_data, list)
-                else student_data
+    # Candidate lookups in precedence order: student_id, then apaar_id (for
+    # EnableStudents), then phone. They run concurrently, together with the
+    # auth group lookup, and the first match in that order wins.
+    candidates = [("student_id", {"student_id": student_id})]
+    if is_enable_students:
+        candidates.append(("apaar_id", {"apaar_id": student_id}))
+    if phone and phone != student_id:
+        candidates.append(("phone", {"phone": phone}))
+
+    # A student_id match takes precedence, so when the identity index knows
+    # the student_id, that lookup runs alone and the others only run if it
+    # misses. The index picks the lookup, the DB record answers.
+    deferred = []
+    if lookup_student_identity("student_id", student_id):
+        candidates, deferred = candidates[:1], candidates[1:]
+
+    pending = [lookups.run(_find_student_record, **params) for _, params in candidates]
+    if auth_group_id:
+        pending.append(
+            lookups.run(
+                get_group_by_child_id_and_type,
+                child_id=auth_group_id,
+                group_type="auth_group",
             )
-
-    # For EnableStudents: if no student found with student_id, try apaar_id
-    found_via_apaar_id = False
-    if not student_record and is_enable_students:
-        logger.info(f"EnableStudents: Trying apaar_id for: {student_id}")
-
-        response = requests.get(
-            student_db_url,
-            params={"apaar_id": student_id},
-            headers=db_request_token(),
         )
-
-        if is_response_valid(response):
-            student_data = is_response_empty(response.json(), False)
-            if student_data:
-                student_record = (
-                    safe_get_first_item(student_data)
-                    if isinstance(student_data, list)
-                    else student_data
-                )
-                found_via_apaar_id = True
-
-    # If still no student found and we have phone, try searching by phone
-    found_via_phone = False
-    if not student_record and phone and phone != student_id:
-        logger.info(f"Trying phone search for: {phone}")
-
-        response = requests.get(
-            student_db_url,
-            params={"phone": phone},
-            headers=db_request_token(),
+    results = await asyncio.gather(*pending, return_exceptions=True)
+    group_result = results[len(candidates)] if auth_group_id else None
+
+    student_record, found_via = _first_student_match(candidates, results)
+    if not student_record and deferred:
+        results = await asyncio.gather(
+            *[lookups.run(_find_student_record, **params) for _, params in deferred],
+            return_exceptions=True,
         )
+        student_record, found_via = _first_student_match(deferred, results)
 
-        if is_response_valid(response):
-            student_data = is_response_empty(response.json(), False)
-            if student_data:
-                student_record = (
-                    safe_get_first_item(student_data)
-                    if isinstance(student_data, list)
-                    else student_data
-                )
-                found_via_phone = True
+    if found_via and found_via != "student_id":
+        logger.info(f"Found student via {found_via} for: {student_id}")
+    found_via_apaar_id = found_via == "apaar_id"
+    found_via_phone = found_via == "phone"
 
     if not student_record:
         logger.warning(f"No student found for: {student_id}")
@@ -525,10 +945,10 @@ async def verify_student_comprehensive(query_params: Dict[str, Any]) -> Dict[str
                 return invalid_response
 
         elif key == "auth_group_id":
-            # Verify user belongs to the auth group
-            group_response = get_group_by_child_id_and_type(
-                child_id=value, group_type="auth_group"
-            )
+            # Verify user belongs to the auth group (looked up above)
+            if isinstance(group_result, BaseException):
+                raise group_result
+            group_response = group_result
 
             if not (
                 group_response
@@ -548,8 +968,8 @@ async def verify_student_comprehensive(query_params: Dict[str, Any]) -> Dict[str
                 logger.warning("Invalid user data in student record")
                 return invalid_response
 
-            group_user_response = get_group_user(
-                group_id=group_record["id"], user_id=user_data["id"]
+            group_user_response = await lookups.run(
+                get_group_user, group_id=group_record["id"], user_id=user_data["id"]
             )
             if not group_user_response or group_user_response == []:
                 logger.info("User not found in auth group")
@@ -575,13 +995,131 @@ async def verify_student_comprehensive(query_params: Dict[str, Any]) -> Dict[str
     return {"is_valid": True, **identifiers}
 
 
+async def verify_students_bulk(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Verify many students with the same rules as verify_student_comprehensive.
+
+    Each item holds the query parameters of one /student/verify call. Items
+    are verified with bounded concurrency and share identical lookups (e.g.
+    the auth group), and results are returned per item in input order.
+    """
+    lookups = StudentLookups()
+    semaphore = asyncio.Semaphore(STUDENT_VERIFY_BULK_CONCURRENCY)
+
+    async def verify_item(index: int, item: Any) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                if not isinstance(item, dict):
+                    raise HTTPException(
+                        status_code=400, detail="Each item must be an object"
+                    )
+                # Compared as strings, as when passed in the /student/verify query
+                query_params = validate_and_build_query_params(
+                    {k: str(v) for k, v in item.items() if v is not None},
+                    STUDENT_QUERY_PARAMS + USER_QUERY_PARAMS + ["auth_group_id"],
+                )
+                result = await verify_student_comprehensive(query_params, lookups)
+            except HTTPException as e:
+                result = {"is_valid": False, "error": e.detail}
+            return {"index": index, **result}
+
+    results = await asyncio.gather(
+        *[verify_item(index, item) for index, item in enumerate(items)]
+    )
+    logger.info(
+        f"Bulk verified {len(items)} students, "
+        f"{sum(result['is_valid'] for result in results)} valid"
+    )
+    return results
+
+
+def get_student_natural_key(data: Dict[str, Any]) -> tuple:
+    """Get the (key, value) a profile update addresses the student by."""
+    identifier_type = next(
+        (key for key in STUDENT_NATURAL_KEYS if data.get(key)), "student_id"
+    )
+    return identifier_type, data.get(identifier_type)
+
+
+def build_profile_update_data(
+    data: Dict[str, Any], identifier_type: str
+) -> Dict[str, Any]:
+    """Build the updatable student and user fields of a profile update."""
+    student_data = build_student_and_user_data(data)
+
+    # Identifiers are not updatable fields
+    for key in ["id", "student_id", "user_id"]:
+        student_data.pop(key, None)
+    if identifier_type == "apaar_id":
+        student_data.pop("apaar_id", None)
+    return student_data
+
+
+async def update_students_bulk(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Apply partial profile updates to many students, each addressed by
+    student_id (or user_id/apaar_id), with bounded concurrency. Returns one
+    result per item, with its index and status: updated, unchanged or failed.
+    """
+    semaphore = asyncio.Semaphore(STUDENT_UPDATE_BULK_CONCURRENCY)
+    seen_identifiers = set()
+
+    def claim_item(item: Any) -> tuple:
+        if not isinstance(item, dict):
+            raise HTTPException(status_code=400, detail="Each item must be an object")
+        identifier_type, identifier = get_student_natural_key(item)
+        if not identifier:
+            raise HTTPException(
+                status_code=400, detail="student_id, user_id or apaar_id is required"
+            )
+        if (identifier_type, str(identifier)) in seen_identifiers:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Duplicate update for {identifier_type} {identifier}",
+            )
+        seen_identifiers.add((identifier_type, str(identifier)))
+        return identifier_type, identifier
+
+    async def update_item(index: int, item: Any) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                identifier_type, identifier = claim_item(item)
+                # Resolving planned exams calls the DB service
+                student_data = await asyncio.to_thread(
+                    build_profile_update_data, item, identifier_type
+                )
+                if not student_data:
+                    raise HTTPException(
+                        status_code=400, detail="No updatable fields given"
+                    )
+                result = await update_student_changed_fields(
+                    identifier_type, identifier, student_data
+                )
+            except HTTPException as e:
+                return {"index": index, "status": "failed", "error": e.detail}
+        return {
+            "index": index,
+            "status": "updated" if result["changed_fields"] else "unchanged",
+            identifier_type: identifier,
+            "changed_fields": result["changed_fields"],
+        }
+
+    results = await asyncio.gather(
+        *[update_item(index, item) for index, item in enumerate(items)]
+    )
+    logger.info(
+        f"Bulk updated {len(items)} students, "
+        f"{sum(result['status'] == 'failed' for result in results)} failed"
+    )
+    return results
+
+
 async def complete_profile_details_service(
     data: Dict[str, Any],
 ) -> Optional[Dict[str, Any]]:
     """Complete profile details - business logic."""
     try:
-        student_identifier = data.get("user_id") or data.get("student_id")
-        identifier_type = "user_id" if data.get("user_id") else "student_id"
+        identifier_type, student_identifier = get_student_natural_key(data)
 
         logger.info(
             f"Completing profile details for student ({identifier_type}): {student_identifier}"
@@ -590,39 +1128,15 @@ async def complete_profile_details_service(
         if not student_identifier:
             raise HTTPException(
                 status_code=400,
-                detail="user_id or student_id is required to complete profile details",
+                detail="user_id, student_id or apaar_id is required to complete profile details",
             )
 
-        student_data = build_student_and_user_data(data)
-
-        if identifier_type == "user_id":
-            student_response = get_students(user_id=student_identifier)
-        else:
-            student_response = get_student_by_id(student_identifier)
-
-        if (
-            not student_response
-            or not isinstance(student_response, list)
-            or len(student_response) == 0
-        ):
-            logger.error(
-                f"Student not found for {identifier_type}: {student_identifier}"
-            )
-            raise HTTPException(status_code=404, detail="Student not found")
-
-        # Safe access to first student
-        first_student = student_response[0]
-        if not isinstance(first_student, dict) or "id" not in first_student:
-            logger.error(f"Invalid student data structure: {first_student}")
-            raise HTTPException(status_code=500, detail="Invalid student data")
-
-        student_data["id"] = first_student["id"]
-        # Remove student_id from patch data as it's an identifier, not an updatable field
-        if "student_id" in student_data:
-            del student_data["student_id"]
-        if "user_id" in student_data:
-            del student_data["user_id"]
-        result = await update_student_data(student_data)
+        student_data = await asyncio.to_thread(
+            build_profile_update_data, data, identifier_type
+        )
+        result = await update_student_changed_fields(
+            identifier_type, student_identifier, student_data
+        )
 
         logger.info("Successfully completed profile details")
         return result
@@ -649,12 +1163,7 @@ async def create_student(request_or_data):
         )
 
         query_params = validate_and_build_query_params(
-            data["form_data"],
-            STUDENT_QUERY_PARAMS
-            + USER_QUERY_PARAMS
-            + ENROLLMENT_RECORD_PARAMS
-            + SCHOOL_QUERY_PARAMS
-            + ["id_generation", "region", "batch_registration"],
+            data["form_data"], STUDENT_CREATE_PARAMS
         )
 
         # School validation
@@ -670,31 +1179,37 @@ async def create_student(request_or_data):
             block_name = query_params.get("block_name")
             state = authgroup_state_mapping.get(data["auth_group"], "")
 
-            school_params = {"name": str(school_name), "district": str(district)}
-            if state:
-                school_params["state"] = state
-            if block_name:
-                school_params["block_name"] = str(block_name)
-
-            school_data = get_school(**school_params)
+            school_data, suggestions = await asyncio.to_thread(
+                resolve_school, school_name, district, state, block_name
+            )
             if not school_data or "id" not in school_data:
                 raise HTTPException(
                     status_code=400,
-                    detail=f"School '{school_name}' not found in district '{district}'",
+                    detail=school_not_found_detail(school_name, district, suggestions),
                 )
 
+            # Store the canonical spelling so later exact lookups find the school
+            query_params["school_name"] = school_data.get("name") or school_name
+            query_params["district"] = school_data.get("district") or district
+            if block_name and school_data.get("block_name"):
+                query_params["block_name"] = school_data["block_name"]
+
         # ID generation logic
         if not data["id_generation"]:
             student_id = query_params.get("student_id")
             if not student_id:
                 raise HTTPException(status_code=400, detail="Student ID is required")
 
-            if await verify_student_by_id(student_id):
-                student_record = normalize_student_record(get_student_by_id(student_id))
-                return build_student_signup_response(student_record, student_id, True)
+            existing_student = await asyncio.to_thread(
+                _find_student_record, student_id=student_id
+            )
+            if existing_student:
+                return build_student_signup_response(existing_student, student_id, True)
         else:
             if data["auth_group"] == "EnableStudents":
-                student_id = EnableStudents(query_params).get_student_id()
+                student_id = await asyncio.to_thread(
+                    EnableStudents(query_params).get_student_id
+                )
                 query_params["student_id"] = student_id
                 if student_id == "":
                     return build_student_signup_response({}, student_id, True)
@@ -716,27 +1231,28 @@ async def create_student(request_or_data):
                         detail="Phone number is required for this auth group",
                     )
                 query_params["student_id"] = phone
-                if await verify_student_by_id(phone):
-                    student_record = normalize_student_record(get_student_by_id(phone))
-                    return build_student_signup_response(student_record, phone, True)
+                existing_student = await asyncio.to_thread(
+                    _find_student_record, student_id=phone
+                )
+                if existing_student:
+                    return build_student_signup_response(existing_student, phone, True)
             else:
                 if not (query_params.get("email") or query_params.get("phone")):
                     raise HTTPException(
                         status_code=400, detail="Email/Phone is required"
                     )
-                if get_user_by_email_and_phone(
-                    email=query_params.get("email"), phone=query_params.get("phone")
-                ):
-                    existing_user = get_user_by_email_and_phone(
-                        email=query_params.get("email"),
-                        phone=query_params.get("phone"),
-                    )
+                existing_user = await asyncio.to_thread(
+                    get_user_by_email_and_phone,
+                    email=query_params.get("email"),
+                    phone=query_params.get("phone"),
+                )
+                if existing_user:
                     student_record = {}
                     if isinstance(existing_user, dict):
                         user_id = existing_user.get("id")
                         if user_id is not None:
                             student_record = normalize_student_record(
-                                get_students(user_id=user_id)
+                                await asyncio.to_thread(get_students, user_id=user_id)
                             )
                     return build_student_signup_response(
                         student_record,
@@ -758,7 +1274,7 @@ async def create_student(request_or_data):
             query_params["grade"] = g12_registration_data["grade"]
             if query_params.get("batch_registration"):
                 batch_id = g12_registration_data["batch_id"]
-                if not get_batch_by_id(batch_id):
+                if not await asyncio.to_thread(get_batch_by_id, batch_id):
                     raise HTTPException(
                         status_code=400,
                         detail=(
@@ -771,7 +1287,9 @@ async def create_student(request_or_data):
         # Process grade
         if "grade" in query_params:
             try:
-                student_grade_data = get_grade_by_number(int(query_params["grade"]))
+                student_grade_data = await asyncio.to_thread(
+                    get_grade_by_number, int(query_params["grade"])
+                )
                 if student_grade_data and "id" in student_grade_data:
                     query_params["grade_id"] = student_grade_data["id"]
             except Exception as e:
@@ -781,12 +1299,14 @@ async def create_student(request_or_data):
 
         # Process exams
         if "planned_competitive_exams" in query_params:
-            exam_ids = []
-            for exam_name in query_params["planned_competitive_exams"]:
-                exam_data = get_exam_by_name(exam_name)
-                if exam_data and "id" in exam_data:
-                    exam_ids.append(exam_data["id"])
-            query_params["planned_competitive_exams"] = exam_ids
+            exams = await asyncio.to_thread(
+                get_exams_by_names, query_params["planned_competitive_exams"]
+            )
+            query_params["planned_competitive_exams"] = [
+                exam_data["id"]
+                for exam_data in exams
+                if exam_data and "id" in exam_data
+            ]
 
         # Process category for PWD
         if (
@@ -802,8 +1322,8 @@ async def create_student(request_or_data):
             )
 
         # Create student record
-        response = requests.post(
-            student_db_url, json=query_params, headers=db_request_token()
+        response = await asyncio.to_thread(
+            requests.post, student_db_url, json=query_params, headers=db_request_token()
         )
         if not is_response_valid(response, "Student API could not post the data!"):
             raise HTTPException(
@@ -813,6 +1333,7 @@ async def create_student(request_or_data):
         new_student_data = is_response_empty(
             response.json(), True, "Student API could not fetch the created student"
         )
+        index_student_record(normalize_student_record(new_student_data))
 
         # Create related records
         await create_auth_group_user_record(new_student_data, data["auth_group"])
@@ -24,9 +24,44 @@ class Settings(BaseModel):
     SQS_ACCESS_KEY: str = os.environ.get("SQS_ACCESS_KEY")
     SQS_SECRET_ACCESS_KEY: str = os.environ.get("SQS_SECRET_ACCESS_KEY")
     AWS_SQS_URL: str = os.environ.get("AWS_SQS_URL")
+    SCHOOL_DIRECTORY_VERSIONS_BUCKET: str = os.environ.get(
+        "SCHOOL_DIRECTORY_VERSIONS_BUCKET"
+    )
+    IDEMPOTENCY_TABLE: str = os.environ.get("IDEMPOTENCY_TABLE")
 
     # Business logic configuration
     DEFAULT_ACADEMIC_YEAR: str = os.environ.get("DEFAULT_ACADEMIC_YEAR", "2025-2026")
+    STUDENT_VERIFY_BULK_MAX_ITEMS: int = int(
+        os.environ.get("STUDENT_VERIFY_BULK_MAX_ITEMS", "500")
+    )
+    STUDENT_UPDATE_BULK_MAX_ITEMS: int = int(
+        os.environ.get("STUDENT_UPDATE_BULK_MAX_ITEMS", "500")
+    )
+    STUDENT_EXPORT_MAX_ROWS: int = int(
+        os.environ.get("STUDENT_EXPORT_MAX_ROWS", "5000")
+    )
+
+    # Caching configuration
+    SCHOOL_DIRECTORY_TTL_SECONDS: int = int(
+        os.environ.get("SCHOOL_DIRECTORY_TTL_SECONDS", "3600")
+    )
+    FORM_SCHEMA_TTL_SECONDS: int = int(os.environ.get("FORM_SCHEMA_TTL_SECONDS", "300"))
+    SCHOOL_SNAPSHOT_MAX_AGE_HOURS: int = int(
+        os.environ.get("SCHOOL_SNAPSHOT_MAX_AGE_HOURS", "24")
+    )
+    COMPILED_FORM_TTL_SECONDS: int = int(
+        os.environ.get("COMPILED_FORM_TTL_SECONDS", "900")
+    )
+    COMPILED_FORM_MAX_AGE_HOURS: int = int(
+        os.environ.get("COMPILED_FORM_MAX_AGE_HOURS", "24")
+    )
+    REFERENCE_DATA_TTL_SECONDS: int = int(
+        os.environ.get("REFERENCE_DATA_TTL_SECONDS", "600")
+    )
+    IDEMPOTENCY_TTL_SECONDS: int = int(os.environ.get("IDEMPOTENCY_TTL_SECONDS", "600"))
+    STUDENT_IDENTITY_TTL_SECONDS: int = int(
+        os.environ.get("STUDENT_IDENTITY_TTL_SECONDS", "900")
+    )
 
 
 # JWT settings
@@ -0,0 +1,11 @@
+import os
+import sys
+from pathlib import Path
+
+# Settings are read from the environment at import time
+os.environ.setdefault("DB_SERVICE_URL", "http://db-service.test/api")
+os.environ.setdefault("DB_SERVICE_TOKEN", "test-token")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+
+# Modules import each other relative to app/, as when run on Lambda
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
@@ -0,0 +1,69 @@
+import copy
+from types import SimpleNamespace
+
+from services import compiled_form_service
+from services.compiled_form_service import FormArtifact, _is_current
+from services.form_service import form_source, school_source
+
+FORM = {"id": 1, "attributes": {"0": {"key": "district"}}}
+
+
+def artifact(form_data, school_version):
+    return FormArtifact(
+        key="1__HaryanaStudents__all__full",
+        version="v",
+        compiled_at="2026-01-01T00:00:00+00:00",
+        body=b"{}",
+        sources={
+            form_source(1): compiled_form_service._content_version(form_data),
+            school_source("Haryana"): school_version,
+        },
+    )
+
+
+def serve_directory(monkeypatch, version):
+    monkeypatch.setattr(
+        compiled_form_service,
+        "get_school_directory",
+        lambda state: SimpleNamespace(version=version),
+    )
+
+
+def test_artifact_is_current_when_no_source_changed(monkeypatch):
+    serve_directory(monkeypatch, "schools-v1")
+
+    assert _is_current(artifact(FORM, "schools-v1"), 1, FORM) is True
+
+
+def test_artifact_is_stale_once_the_form_row_changes(monkeypatch):
+    serve_directory(monkeypatch, "schools-v1")
+    edited = {**FORM, "name": "Renamed"}
+
+    assert _is_current(artifact(FORM, "schools-v1"), 1, edited) is False
+
+
+def test_artifact_is_stale_once_the_school_directory_changes(monkeypatch):
+    serve_directory(monkeypatch, "schools-v2")
+
+    assert _is_current(artifact(FORM, "schools-v1"), 1, FORM) is False
+
+
+def test_artifact_is_not_cached_when_dynamic_data_could_not_be_fetched(monkeypatch):
+    compiled_form_service._artifact_cache.clear()
+    serve_directory(monkeypatch, "schools-v1")
+    monkeypatch.setattr(
+        compiled_form_service, "get_form_schema", lambda id: copy.deepcopy(FORM)
+    )
+
+    def enhance(form_data, auth_group, locale, lazy, context):
+        context.failed_sources.add(school_source("Haryana"))
+        return form_data
+
+    monkeypatch.setattr(
+        compiled_form_service, "enhance_form_schema_with_dynamic_data", enhance
+    )
+
+    served = compiled_form_service.get_form_artifact(1, "HaryanaStudents")
+
+    assert served.failed_sources == (school_source("Haryana"),)
+    assert compiled_form_service._artifact_cache.get(served.key) is None
@@ -0,0 +1,76 @@
+import pytest
+from fastapi import HTTPException
+
+from services import form_service
+from services.form_service import (
+    EnhancementContext,
+    _PageColumns,
+    _missing_mask,
+    _transpose_masks,
+    enhance_form_schema_with_dynamic_data,
+    get_profile_completeness_for_group,
+    is_student_attribute_empty,
+    is_user_attribute_empty,
+    school_source,
+)
+
+STUDENTS = [
+    {"student_id": "S1", "grade_id": 3, "user": {"id": 1, "first_name": "Asha"}},
+    {"student_id": "S2", "grade_id": None, "user": {"id": 2, "first_name": ""}},
+    {"student_id": "", "user": None, "guardian_name": "G", "father_name": "F"},
+    {
+        "student_id": "S4",
+        "grade_id": "",
+        "user": {},
+        "guardian_name": "G",
+        "guardian_relation": "Uncle",
+        "guardian_phone": "99",
+        "guardian_education_level": "BA",
+        "guardian_profession": "Farmer",
+    },
+]
+
+
+def test_transpose_masks_turns_field_columns_into_student_rows():
+    # Field 0 is missing for students 0 and 2, field 1 for student 1 and 2
+    field_masks = [0b101, 0b110]
+
+    assert _transpose_masks(field_masks, 4) == [0b01, 0b10, 0b11, 0b00]
+
+
+@pytest.mark.parametrize(
+    "key", ["first_name", "student_id", "grade", "primary_contact", "father_name"]
+)
+def test_missing_mask_matches_the_per_student_checks(key):
+    field = {"key": key}
+    expected = sum(
+        1 << index
+        for index, student_data in enumerate(STUDENTS)
+        if is_user_attribute_empty(field, student_data)
+        or is_student_attribute_empty(field, student_data)
+    )
+
+    assert _missing_mask(field, _PageColumns(STUDENTS)) == expected
+
+
+def test_completeness_requires_group_type_with_group_id(monkeypatch):
+    monkeypatch.setattr(form_service, "get_compiled_form", lambda form_id: object())
+
+    with pytest.raises(HTTPException) as error:
+        get_profile_completeness_for_group("form-1", group_id="42")
+
+    assert error.value.status_code == 400
+
+
+def test_enhancement_records_a_school_mapping_that_could_not_be_fetched(monkeypatch):
+    monkeypatch.setattr(
+        form_service,
+        "get_dependant_field_mapping_for_auth_group",
+        lambda *args, **kwargs: {"error": "Database error"},
+    )
+    form = {"attributes": {"0": {"key": "district"}, "1": {"key": "school_name"}}}
+    context = EnhancementContext()
+
+    enhance_form_schema_with_dynamic_data(form, "HaryanaStudents", context=context)
+
+    assert context.failed_sources == {school_source("Haryana")}
@@ -0,0 +1,81 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI, Request
+
+import idempotency
+from idempotency import idempotent
+
+
+def build_app(runs):
+    app = FastAPI()
+
+    @app.post("/items")
+    @idempotent
+    async def create_item(request: Request):
+        data = await request.json()
+        runs.append(data)
+        await asyncio.sleep(0.2)
+        if data.get("fail"):
+            raise ValueError("create failed")
+        return {"run": len(runs)}
+
+    return app
+
+
+def post_all(app, requests):
+    async def run():
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://t"
+        ) as client:
+            return await asyncio.gather(
+                *[
+                    client.post("/items", json=body, headers={"Idempotency-Key": key})
+                    for key, body in requests
+                ]
+            )
+
+    return asyncio.run(run())
+
+
+def setup_function():
+    idempotency._store = idempotency._LocalStore()
+
+
+def test_concurrent_retries_get_the_first_result():
+    runs = []
+    responses = post_all(build_app(runs), [("k1", {"auth_group": "A"})] * 3)
+
+    assert [response.json() for response in responses] == [{"run": 1}] * 3
+    assert len(runs) == 1
+
+
+def test_same_key_with_another_body_is_rejected():
+    app = build_app([])
+    post_all(app, [("k1", {"auth_group": "A"})])
+
+    (response,) = post_all(app, [("k1", {"auth_group": "A", "name": "other"})])
+
+    assert response.status_code == 422
+
+
+def test_keys_are_scoped_to_the_auth_group():
+    runs = []
+    app = build_app(runs)
+    post_all(app, [("k1", {"auth_group": "A"})])
+
+    (response,) = post_all(app, [("k1", {"auth_group": "B"})])
+
+    assert response.json() == {"run": 2}
+
+
+def test_failed_request_releases_its_key():
+    runs = []
+    app = build_app(runs)
+    (failed,) = post_all(app, [("k1", {"fail": True})])
+
+    (retried,) = post_all(app, [("k1", {"fail": False})])
+
+    assert failed.status_code == 500
+    assert retried.json() == {"run": 2}
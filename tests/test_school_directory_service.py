@@ -0,0 +1,263 @@
+import pytest
+from fastapi import HTTPException
+
+from services import school_directory_service
+from services.school_directory_service import (
+    SchoolDirectory,
+    normalize_school_text,
+    resolve_school,
+)
+
+STATE = "Haryana"
+
+
+def school(school_id, name, district="Gurugram", block_name=None):
+    return {
+        "id": school_id,
+        "name": name,
+        "district": district,
+        "block_name": block_name,
+        "state": STATE,
+    }
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("  Govt. Sr. Sec.  School,Sector-12 ", "govt sr sec school sector 12"),
+        ("GOVERNMENT HIGH SCHOOL", "government high school"),
+        ("School (No. 2)", "school no 2"),
+        (None, ""),
+        (12, "12"),
+    ],
+)
+def test_normalize_school_text(value, expected):
+    assert normalize_school_text(value) == expected
+
+
+def test_resolve_matches_case_punctuation_and_spacing_variants():
+    directory = SchoolDirectory(
+        STATE, [school(1, "Government Senior Secondary School Sector 12")]
+    )
+
+    match = directory.resolve(
+        "government senior  secondary school, sector-12", "GURUGRAM"
+    )
+
+    assert match.school["id"] == 1
+    assert match.suggestions == []
+
+
+def test_resolve_matches_reordered_words_when_unambiguous():
+    directory = SchoolDirectory(STATE, [school(1, "GSSS Sector 12 Gurugram")])
+
+    assert directory.resolve("Gurugram GSSS Sector 12", "Gurugram").school["id"] == 1
+
+
+def test_resolve_does_not_accept_reordered_words_matching_several_schools():
+    directory = SchoolDirectory(
+        STATE, [school(1, "Sector 12 GSSS"), school(2, "GSSS Sector 12")]
+    )
+
+    match = directory.resolve("GSSS 12 Sector", "Gurugram")
+
+    assert match.school is None
+
+
+@pytest.mark.parametrize("typed", ["Sector 13", "Sector 2"])
+def test_resolve_never_accepts_a_school_with_a_different_number(typed):
+    directory = SchoolDirectory(
+        STATE, [school(1, "Government Senior Secondary School Sector 12")]
+    )
+
+    match = directory.resolve(f"Government Senior Secondary School {typed}", "Gurugram")
+
+    assert match.school is None
+    assert match.suggestions == ["Government Senior Secondary School Sector 12"]
+
+
+def test_resolve_returns_close_spellings_as_suggestions_only():
+    directory = SchoolDirectory(STATE, [school(1, "Government High School Badshahpur")])
+
+    match = directory.resolve("Government High School Badshapur", "Gurugram")
+
+    assert match.school is None
+    assert match.suggestions == ["Government High School Badshahpur"]
+
+
+def test_resolve_only_looks_in_the_given_district_and_block():
+    directory = SchoolDirectory(
+        STATE,
+        [
+            school(1, "GHS Khor", district="Rewari", block_name="Khol"),
+            school(2, "GHS Khor", district="Gurugram", block_name="Sohna"),
+            school(3, "GHS Khor", district="Gurugram", block_name="Farukhnagar"),
+        ],
+    )
+
+    assert directory.resolve("GHS Khor", "Gurugram", "Farukhnagar").school["id"] == 3
+    assert directory.resolve("GHS Khor", "Nuh").school is None
+
+
+def test_resolve_school_falls_back_to_exact_db_lookup_on_directory_miss(
+    monkeypatch,
+):
+    directory = SchoolDirectory(STATE, [school(1, "GSSS Sector 12")])
+    new_school = school(2, "GSSS Sector 13")
+    lookups = []
+
+    def get_school(**params):
+        lookups.append(params)
+        return new_school
+
+    monkeypatch.setattr(
+        school_directory_service, "get_school_directory", lambda state: directory
+    )
+    monkeypatch.setattr(school_directory_service, "get_school", get_school)
+
+    match = resolve_school("GSSS Sector 13", "Gurugram", STATE)
+
+    assert match.school == new_school
+    assert match.suggestions == []
+    assert lookups == [
+        {"name": "GSSS Sector 13", "district": "Gurugram", "state": STATE}
+    ]
+
+
+def test_resolve_school_returns_directory_suggestions_when_db_misses(monkeypatch):
+    directory = SchoolDirectory(STATE, [school(1, "GSSS Sector 12")])
+
+    def get_school(**params):
+        raise HTTPException(status_code=404, detail="School does not exist!")
+
+    monkeypatch.setattr(
+        school_directory_service, "get_school_directory", lambda state: directory
+    )
+    monkeypatch.setattr(school_directory_service, "get_school", get_school)
+
+    match = resolve_school("GSSS Sector 13", "Gurugram", STATE)
+
+    assert match.school is None
+    assert match.suggestions == ["GSSS Sector 12"]
+
+
+def test_resolve_school_does_not_query_db_on_directory_match(monkeypatch):
+    directory = SchoolDirectory(STATE, [school(1, "GSSS Sector 12")])
+
+    def get_school(**params):
+        raise AssertionError("unexpected DB lookup")
+
+    monkeypatch.setattr(
+        school_directory_service, "get_school_directory", lambda state: directory
+    )
+    monkeypatch.setattr(school_directory_service, "get_school", get_school)
+
+    assert resolve_school("gsss sector-12", "gurugram", STATE).school["id"] == 1
+
+
+def load_directory(monkeypatch, schools):
+    school_directory_service._directory_cache.clear()
+    monkeypatch.setattr(
+        school_directory_service, "get_schools_by_location", lambda params: schools
+    )
+    return school_directory_service.get_school_directory(STATE)
+
+
+def test_school_changes_since_diffs_against_the_stored_version(monkeypatch):
+    load_directory(monkeypatch, [school(1, "School A"), school(2, "School B")])
+    old = school_directory_service.get_school_changes_since(STATE, None)
+    load_directory(monkeypatch, [school(1, "School A1"), school(3, "School C")])
+    # Another container only knows the new version and reads the old one back
+    school_directory_service._version_records.clear()
+
+    changes = school_directory_service.get_school_changes_since(STATE, old["version"])
+
+    assert changes["full_resync"] is False
+    assert sorted(record["id"] for record in changes["changed"]) == [1, 3]
+    assert changes["removed"] == [2]
+
+
+def test_loading_the_directory_does_not_store_a_version(monkeypatch):
+    def save(directory):
+        raise AssertionError("stored on the request path")
+
+    monkeypatch.setattr(school_directory_service, "_save_directory_version", save)
+
+    assert load_directory(monkeypatch, [school(1, "School A")]) is not None
+
+
+def test_school_changes_since_unknown_version_is_a_full_resync(monkeypatch):
+    load_directory(monkeypatch, [school(1, "School A")])
+
+    changes = school_directory_service.get_school_changes_since(
+        STATE, "0123456789abcdef"
+    )
+
+    assert changes["full_resync"] is True
+    assert [record["id"] for record in changes["changed"]] == [1]
+
+
+def test_resolve_does_not_fall_back_to_the_district_on_an_unknown_block():
+    directory = SchoolDirectory(
+        STATE, [school(2, "GHS Khor", district="Gurugram", block_name="Sohna")]
+    )
+
+    match = directory.resolve("GHS Khor", "Gurugram", "Typo")
+
+    assert match.school is None
+    assert match.suggestions == ["GHS Khor"]
+
+
+def test_resolve_does_not_pick_between_schools_sharing_a_name(monkeypatch):
+    directory = SchoolDirectory(
+        STATE,
+        [
+            school(2, "GHS Khor", block_name="Sohna"),
+            school(3, "GHS-Khor", block_name="Farukhnagar"),
+        ],
+    )
+    monkeypatch.setattr(
+        school_directory_service, "get_school_directory", lambda state: directory
+    )
+
+    def get_school(**params):
+        raise AssertionError("the DB lookup would pick one of them")
+
+    monkeypatch.setattr(school_directory_service, "get_school", get_school)
+
+    match = resolve_school("GHS Khor", "Gurugram", STATE)
+
+    assert match.school is None
+    assert match.suggestions == ["GHS Khor (Sohna)", "GHS-Khor (Farukhnagar)"]
+
+
+def test_school_pages_are_cut_from_the_directory_listing(monkeypatch):
+    directory = SchoolDirectory(
+        STATE,
+        [
+            school(3, "B"),
+            school(1, "C"),
+            school(2, "B"),
+            school(4, "A", district="Rewari"),
+            school(5, "A"),
+        ],
+    )
+    monkeypatch.setattr(
+        school_directory_service, "query_snapshot_school_page", lambda *args: None
+    )
+    monkeypatch.setattr(
+        school_directory_service, "get_school_directory", lambda state: directory
+    )
+
+    pages = []
+    cursor = None
+    while True:
+        page = school_directory_service.get_school_page(
+            state=STATE, district="Gurugram", limit=2, cursor=cursor
+        )
+        pages.append([school["id"] for school in page["schools"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == [[5, 2], [3, 1]]
@@ -0,0 +1,30 @@
+import asyncio
+
+from services import school_service
+from services.school_service import find_school_by_code_or_udise_code
+
+
+def serve_schools_by_identifier(monkeypatch, schools):
+    calls = []
+
+    def fetch(identifier_type, code):
+        calls.append((identifier_type, code))
+        return schools.get((identifier_type, code))
+
+    monkeypatch.setattr(school_service, "_fetch_school_by_identifier", fetch)
+    return calls
+
+
+def test_code_match_takes_precedence_and_is_cached_per_code(monkeypatch):
+    school_service._school_code_cache.clear()
+    school_a = {"id": 1, "code": "X"}
+    school_b = {"id": 2, "code": "Y", "udise_code": "X"}
+    calls = serve_schools_by_identifier(
+        monkeypatch, {("code", "X"): school_a, ("udise_code", "X"): school_b}
+    )
+
+    first = asyncio.run(find_school_by_code_or_udise_code("X"))
+    second = asyncio.run(find_school_by_code_or_udise_code("X"))
+
+    assert first == second == (school_a, False)
+    assert len(calls) == 2
@@ -0,0 +1,111 @@
+import pytest
+
+from services import school_snapshot_service
+from services.school_snapshot_service import (
+    SNAPSHOT_COLUMNS,
+    _fetch_all_schools,
+    _has_new_schools,
+    query_snapshot_school_page,
+)
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self._data = data
+        self.status_code = status_code
+        self.text = str(data)
+
+    def json(self):
+        return self._data
+
+
+def serve_schools(monkeypatch, schools, page_cap):
+    """Serve schools like the DB service, capping pages at page_cap rows."""
+    calls = []
+
+    def get(url, params=None, headers=None):
+        calls.append(params)
+        offset = params.get("offset", 0)
+        limit = min(params.get("limit", page_cap), page_cap)
+        return FakeResponse(schools[offset : offset + limit])
+
+    monkeypatch.setattr(school_snapshot_service.requests, "get", get)
+    return calls
+
+
+def test_fetch_all_schools_pages_past_a_db_cap_below_the_page_size(monkeypatch):
+    schools = [{"id": i, "name": f"School {i}"} for i in range(25)]
+    serve_schools(monkeypatch, schools, page_cap=10)
+
+    fetched = _fetch_all_schools()
+
+    assert [school["id"] for school in fetched] == list(range(25))
+
+
+def test_fetch_all_schools_fails_when_pages_overlap(monkeypatch):
+    schools = [{"id": i} for i in range(5)]
+
+    def get(url, params=None, headers=None):
+        offset = params["offset"]
+        return FakeResponse(schools[max(offset - 1, 0) : offset + 3])
+
+    monkeypatch.setattr(school_snapshot_service.requests, "get", get)
+
+    with pytest.raises(RuntimeError):
+        _fetch_all_schools()
+
+
+def test_fetch_all_schools_fails_on_an_empty_directory(monkeypatch):
+    serve_schools(monkeypatch, [], page_cap=10)
+
+    with pytest.raises(RuntimeError):
+        _fetch_all_schools()
+
+
+def test_has_new_schools_asks_for_one_school_past_the_snapshot(monkeypatch):
+    school_snapshot_service._new_schools_checks.clear()
+    schools = [{"id": i, "state": "Haryana"} for i in range(3)]
+    calls = serve_schools(monkeypatch, schools, page_cap=10)
+
+    assert _has_new_schools({"state": "Haryana"}, 2) is True
+    assert calls == [{"state": "Haryana", "offset": 2, "limit": 1}]
+
+
+def test_has_new_schools_caches_a_current_answer(monkeypatch):
+    school_snapshot_service._new_schools_checks.clear()
+    calls = serve_schools(monkeypatch, [{"id": 1}], page_cap=10)
+
+    assert _has_new_schools({"state": "Punjab"}, 1) is False
+    assert _has_new_schools({"state": "Punjab"}, 1) is False
+    assert len(calls) == 1
+
+
+def test_snapshot_page_reads_named_schools_after_the_cursor(monkeypatch, tmp_path):
+    schools = [
+        {"id": 4, "name": "B", "state": "Haryana"},
+        {"id": 1, "name": "C", "state": "Haryana"},
+        {"id": 2, "name": "B", "state": "Haryana"},
+        {"id": 3, "name": "A", "state": "Punjab"},
+        {"id": 5, "name": None, "state": "Haryana"},
+        {"id": 6, "name": "A", "state": "Haryana"},
+    ]
+    path = tmp_path / "school_directory.sqlite"
+    monkeypatch.setattr(
+        school_snapshot_service,
+        "_fetch_all_schools",
+        lambda: [
+            {column: school.get(column) for column in SNAPSHOT_COLUMNS}
+            for school in schools
+        ],
+    )
+    school_snapshot_service.export_school_snapshot(path)
+    monkeypatch.setattr(school_snapshot_service, "SCHOOL_SNAPSHOT_PATH", path)
+    monkeypatch.setattr(school_snapshot_service, "_connection", None)
+    monkeypatch.setattr(school_snapshot_service, "_snapshot_info", None)
+    monkeypatch.setattr(school_snapshot_service, "_has_new_schools", lambda *a: False)
+
+    first = query_snapshot_school_page({"state": "Haryana"}, None, 2)
+    second = query_snapshot_school_page({"state": "Haryana"}, ("B", 2), 2)
+
+    assert [school["id"] for school in first] == [6, 2]
+    assert [school["id"] for school in second] == [4, 1]
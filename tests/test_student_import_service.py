@@ -0,0 +1,27 @@
+from services.student_import_service import find_duplicate_rows, parse_import_rows
+
+
+def test_csv_boolean_columns_are_parsed():
+    rows = parse_import_rows(
+        b"student_id,batch_registration\nS1,false\nS2,TRUE\nS3,maybe\n", "csv"
+    )
+
+    assert [row["batch_registration"] for row in rows] == [False, True, "maybe"]
+
+
+def test_rows_repeating_an_identifier_are_rejected():
+    rows = [
+        {"student_id": "S1", "phone": "90"},
+        {"student_id": "S2", "phone": "90"},
+        {"student_id": "S1"},
+        {"student_id": "S3"},
+    ]
+
+    errors = find_duplicate_rows(rows, [None, None, None, "invalid"])
+
+    assert errors == [
+        None,
+        "Duplicate phone '90', already in row 0",
+        "Duplicate student_id 'S1', already in row 0",
+        "invalid",
+    ]
@@ -0,0 +1,206 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from services import student_service
+from services.student_service import update_student_changed_fields
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self._data = data
+        self.status_code = status_code
+        self.text = str(data)
+
+    def json(self):
+        return self._data
+
+
+def serve_student(monkeypatch, stored):
+    patches = []
+
+    def patch(url, json=None, headers=None):
+        patches.append(json)
+        stored.update(json)
+        return FakeResponse(dict(stored))
+
+    monkeypatch.setattr(
+        student_service, "fetch_student_by_natural_key", lambda key, value: stored
+    )
+    monkeypatch.setattr(student_service.requests, "patch", patch)
+    return patches
+
+
+def test_update_diffs_against_a_fresh_read(monkeypatch):
+    stored = {"id": 7, "student_id": "S1", "father_name": "A", "updated_at": "v1"}
+    patches = serve_student(monkeypatch, stored)
+    asyncio.run(update_student_changed_fields("student_id", "S1", {"father_name": "B"}))
+    # Another writer changes the record back; the same update must be sent again
+    stored["father_name"] = "A"
+
+    result = asyncio.run(
+        update_student_changed_fields("student_id", "S1", {"father_name": "B"})
+    )
+
+    assert result["changed_fields"] == ["father_name"]
+    assert patches == [{"father_name": "B"}, {"father_name": "B"}]
+
+
+def serve_student_pages(monkeypatch, rows):
+    """Serve students by offset in id order, like the DB service."""
+    monkeypatch.setattr(
+        student_service,
+        "get_students_page",
+        lambda offset, limit, **params: rows[offset : offset + limit],
+    )
+
+
+def page_ids(page):
+    return [student["id"] for student in page["students"]]
+
+
+def test_student_pages_neither_skip_nor_repeat_when_rows_are_removed(monkeypatch):
+    rows = [{"id": student_id} for student_id in range(1, 12)]
+    serve_student_pages(monkeypatch, rows)
+
+    first = student_service.get_students_paginated(limit=3)
+    del rows[0:2]
+    second = student_service.get_students_paginated(
+        limit=3, cursor=first["next_cursor"]
+    )
+    # More rows removed before the cursor than one page looks back
+    del rows[0:4]
+    third = student_service.get_students_paginated(
+        limit=3, cursor=second["next_cursor"]
+    )
+
+    assert [page_ids(first), page_ids(second), page_ids(third)] == [
+        [1, 2, 3],
+        [4, 5, 6],
+        [7, 8, 9],
+    ]
+
+
+def test_student_pages_reject_rows_out_of_id_order(monkeypatch):
+    serve_student_pages(monkeypatch, [{"id": 3}, {"id": 1}])
+
+    with pytest.raises(HTTPException) as error:
+        student_service.get_students_paginated(limit=3)
+
+    assert error.value.status_code == 500
+
+
+def test_iter_student_pages_walks_every_student_once(monkeypatch):
+    serve_student_pages(
+        monkeypatch, [{"id": student_id} for student_id in range(1, 12)]
+    )
+
+    pages = list(student_service.iter_student_pages(page_size=4))
+
+    assert [[student["id"] for student in page] for page in pages] == [
+        [1, 2, 3, 4],
+        [5, 6, 7, 8],
+        [9, 10, 11],
+    ]
+
+
+def test_student_export_stops_past_max_rows(monkeypatch):
+    serve_student_pages(
+        monkeypatch, [{"id": student_id} for student_id in range(1, 12)]
+    )
+
+    with pytest.raises(HTTPException) as error:
+        "".join(student_service.iter_student_export("ndjson", max_rows=5))
+
+    assert error.value.status_code == 400
+
+
+def test_unpaged_student_listing_is_capped(monkeypatch):
+    sent = []
+
+    def get(url, params=None, headers=None):
+        sent.append(params)
+        return FakeResponse([{"id": i} for i in range(params["limit"])])
+
+    monkeypatch.setattr(student_service.requests, "get", get)
+
+    with pytest.raises(HTTPException) as error:
+        student_service.get_students(grade=11)
+
+    assert error.value.status_code == 400
+    assert sent == [{"grade": 11, "limit": student_service.STUDENT_PAGE_MAX_LIMIT + 1}]
+
+
+def test_student_id_lookup_runs_when_the_value_is_indexed_as_an_apaar_id(
+    monkeypatch,
+):
+    student_service.index_student_record({"id": 1, "apaar_id": "X1", "user_id": 10})
+    by_student_id = [{"id": 2, "student_id": "X1"}]
+
+    by_apaar_id = [{"id": 1, "apaar_id": "X1"}]
+
+    def get_students(**params):
+        return by_student_id if "student_id" in params else by_apaar_id
+
+    monkeypatch.setattr(student_service, "get_students", get_students)
+
+    assert student_service.get_student_by_id("X1") == by_student_id
+    assert (
+        asyncio.run(student_service.get_student_by_id_concurrently("X1"))
+        == by_student_id
+    )
+
+
+def test_identity_index_records_phone_and_user_id():
+    identity = student_service.index_student_record(
+        {"id": 3, "student_id": "S3", "user": {"id": 30, "phone": "9000000003"}}
+    )
+
+    assert identity.user_id == "30"
+    assert student_service.lookup_student_identity("phone", "9000000003") == identity
+    assert student_service.lookup_student_identity("user_id", 30) == identity
+
+
+def test_verify_reads_the_student_even_when_the_index_knows_them(monkeypatch):
+    student_service.index_student_record({"id": 7, "student_id": "S7"})
+    lookups = []
+
+    def find(**params):
+        # The student was removed since the index saw them
+        lookups.append(params)
+        return None
+
+    monkeypatch.setattr(student_service, "_find_student_record", find)
+
+    result = asyncio.run(
+        student_service.verify_student_comprehensive(
+            {"student_id": "S7", "phone": "99"}
+        )
+    )
+
+    assert result == {"is_valid": False}
+    assert lookups == [{"student_id": "S7"}, {"phone": "99"}]
+
+
+def test_bulk_update_builds_items_off_the_event_loop(monkeypatch):
+    loop_thread = threading.get_ident()
+    build_threads = []
+
+    def build(item, identifier_type):
+        build_threads.append(threading.get_ident())
+        return {"father_name": item["father_name"]}
+
+    async def update(key, value, student_data):
+        return {"changed_fields": sorted(student_data)}
+
+    monkeypatch.setattr(student_service, "build_profile_update_data", build)
+    monkeypatch.setattr(student_service, "update_student_changed_fields", update)
+
+    results = asyncio.run(
+        student_service.update_students_bulk([{"student_id": "S1", "father_name": "A"}])
+    )
+
+    assert results[0]["status"] == "updated"
+    assert loop_thread not in build_threads